@@ -3,7 +3,8 @@
 #include "command/command_utilities.h"
 #include "../ipc/mcp_server.h"  // Include MCPServer definition
 #include <ctime>  // For std::time and gmtime_s
-#include <algorithm>  // For std::max and std::min
+#include <algorithm>  // For std::max, std::min and std::transform
+#include <cctype>  // For std::tolower
 #include <sstream>  // For std::istringstream
 
 void EnhancedCommandHandlers::RegisterHandlers(MCPServer& server) {
@@ -443,15 +444,11 @@ json EnhancedCommandHandlers::HandleProcessCommand(int id, const std::string& co
         
         if (output.empty()) {
             // Try with ".process /r /p" instead which is more reliable
-            size_t addressPos = command.find(" ");
-            if (addressPos != std::string::npos) {
-                std::string processAddress = command.substr(addressPos + 1);
-                // Remove any flags
-                size_t flagsPos = processAddress.find(" ");
-                if (flagsPos != std::string::npos) {
-                    processAddress = processAddress.substr(0, flagsPos);
-                }
-                
+            // Tokenize once: "!process [address] [flags]"; flags are not needed here
+            std::istringstream tokens(command);
+            std::string verb, processAddress;
+            tokens >> verb >> processAddress;
+            if (!processAddress.empty()) {
                 std::string alternateCmd = ".process /r /p " + processAddress;
                 output = CommandUtilities::ExecuteWinDbgCommand(alternateCmd, timeout);
                 
@@ -598,9 +595,35 @@ json EnhancedCommandHandlers::HandleAddressCommand(int id, const std::string& co
                 alternateCmd = "!address";
                 std::string altOutput = CommandUtilities::ExecuteWinDbgCommand(alternateCmd, timeout);
                 if (!altOutput.empty()) {
-                    // Filter for executable regions in the output
-                    // This is simplified; in reality we would need more sophisticated parsing
-                    output = "Executable memory regions:\n" + altOutput;
+                    // Keep only the regions whose protection mentions Execute,
+                    // scanning the buffer once without splitting it into lines.
+                    // !address prints both "PAGE_EXECUTE_READ" and "Execute", so
+                    // matches run against a lowercase copy with identical offsets
+                    std::string lowered(altOutput);
+                    std::transform(lowered.begin(), lowered.end(), lowered.begin(),
+                        [](unsigned char c) { return static_cast<char>(std::tolower(c)); });
+                    output = "Executable memory regions:\n";
+                    output.reserve(output.size() + altOutput.size());
+                    size_t lineStart = 0;
+                    while (lineStart < altOutput.size()) {
+                        size_t lineEnd = lowered.find('\n', lineStart);
+                        if (lineEnd == std::string::npos) {
+                            lineEnd = lowered.size();
+                        }
+                        size_t match = lowered.find("execute", lineStart);
+                        if (match == std::string::npos) {
+                            break;
+                        }
+                        if (match < lineEnd) {
+                            output.append(altOutput, lineStart, lineEnd - lineStart);
+                            output.push_back('\n');
+                        }
+                        else {
+                            // Jump straight to the line containing the next match
+                            lineEnd = lowered.rfind('\n', match);
+                        }
+                        lineStart = lineEnd + 1;
+                    }
                     return CommandUtilities::CreateSuccessResponse(id, "execute_command", output);
                 }
             }
@@ -6,6 +6,10 @@
 // Buffer size for reading from the pipe
 constexpr DWORD BUFFER_SIZE = 4096;
 
+// Kernel output buffer for the pipe; matches the client's read size (BUFFER_SIZE
+// in mcp_server/config.py) so large responses drain in fewer ReadFile calls
+constexpr DWORD PIPE_OUTPUT_BUFFER_SIZE = 65536;
+
 MCPServer::MCPServer() : m_running(false) {
 }
 
@@ -100,7 +104,7 @@ HANDLE MCPServer::CreatePipeInstance() {
         PIPE_READMODE_MESSAGE |            // Message-read mode
         PIPE_WAIT,                         // Blocking mode
         PIPE_UNLIMITED_INSTANCES,          // Max instances
-        BUFFER_SIZE,                       // Output buffer size
+        PIPE_OUTPUT_BUFFER_SIZE,           // Output buffer size
         BUFFER_SIZE,                       // Input buffer size
         0,                                 // Default time-out (50 ms)
         NULL);                             // Default security attributes
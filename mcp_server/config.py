@@ -4,9 +4,14 @@ Centralized configuration for WinDbg MCP Server.
 This module contains all configuration constants, timeouts, and settings
 used throughout the application to ensure consistency and easy maintenance.
 """
+import logging
+import re
 from enum import Enum
 from typing import Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
 
 # ====================================================================
 # COMMUNICATION SETTINGS
@@ -14,7 +19,7 @@ from dataclasses import dataclass
 
 # Named pipe configuration
 PIPE_NAME = r"\\.\pipe\windbgmcp"
-BUFFER_SIZE = 8192
+BUFFER_SIZE = 65536  # Per-read size; keep in sync with the extension's pipe output buffer
 
 # Basic timeout settings (in milliseconds)
 DEFAULT_TIMEOUT_MS = 30000
@@ -32,6 +37,12 @@ MAX_RETRY_ATTEMPTS = 3
 RETRY_DELAY_MS = 1000
 NETWORK_DEBUGGING_TIMEOUT_MULTIPLIER = 2.0
 
+# Adaptive timeouts: per-category smoothed execution time plus 4x deviation,
+# used once enough samples have been observed to extend (never shorten) the
+# static per-command timeout
+ADAPTIVE_TIMEOUTS_ENABLED = True
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 8
+
 # ====================================================================
 # MONITORING SETTINGS
 # ====================================================================
@@ -56,6 +67,23 @@ DEFAULT_CACHE_SIZE = 100
 MAX_CACHE_AGE_HOURS = 1
 CACHE_CLEANUP_INTERVAL = 300  # 5 minutes
 
+# Read-only commands whose output only changes when the target runs
+CACHEABLE_COMMANDS = frozenset({"version", "vertarget", ".effmach", "lm"})
+# Commands that let the target run, change breakpoints or reload state,
+# invalidating cached output (matched on the leading token of each segment)
+CACHE_INVALIDATING_COMMANDS = frozenset({
+    "g", "gc", "gh", "gn", "gu",
+    "p", "pa", "pc", "ph", "pt",
+    "t", "ta", "tc", "th", "tt", "wt",
+    "bp", "bc",
+    ".cxr", ".ecxr",
+    ".reload", ".restart", ".reboot"
+})
+# Commands that only display the current context when bare, but switch the
+# process, thread or effective machine (and so what lm/.effmach show) when
+# given arguments, e.g. ".process /r /p <addr>" or ".effmach x86"
+CACHE_INVALIDATING_CONTEXT_COMMANDS = frozenset({".process", ".thread", ".effmach"})
+
 # Async operation limits
 MAX_CONCURRENT_OPERATIONS = 5
 TASK_CLEANUP_INTERVAL_HOURS = 1
@@ -70,6 +98,9 @@ MAX_RECOVERY_ATTEMPTS = 3
 SESSION_SNAPSHOT_INTERVAL = 300  # 5 minutes
 SESSION_STATE_FILE = "windbg_session_state.json"
 
+# How long a probed process/thread context is reused before re-querying
+CONTEXT_CACHE_TTL_SECONDS = 2.0
+
 # ====================================================================
 # DEBUGGING MODE CONFIGURATION
 # ====================================================================
@@ -92,7 +123,7 @@ class OptimizationLevel(Enum):
 # TIMEOUT CONFIGURATIONS
 # ====================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeoutConfig:
     """Timeout configuration for different command types."""
     quick: int = 10000     # Quick commands (version, help, etc.)
@@ -107,7 +138,7 @@ class TimeoutConfig:
     symbols: int = 300000         # Symbol operations (.reload, .sympath)
     extended: int = 1200000        # Extended operations (.reload /f, heavy symbol loading)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RetryConfig:
     """Retry configuration for resilient operations."""
     max_attempts: int = 3
@@ -127,31 +158,38 @@ TIMEOUT_MULTIPLIERS = {
     DebuggingMode.REMOTE: 2.5
 }
 
+# Final timeouts per (category, mode), with the multiplier already applied
+FINAL_TIMEOUTS = {
+    (field.name, mode): int(getattr(DEFAULT_TIMEOUTS, field.name) * TIMEOUT_MULTIPLIERS.get(mode, 1.0))
+    for field in fields(TimeoutConfig)
+    for mode in DebuggingMode
+}
+
 # ====================================================================
 # COMMAND CATEGORIES
 # ====================================================================
 
 # Commands by timeout category
-QUICK_COMMANDS = {"version", "help", "?", "r"}
-NORMAL_COMMANDS = {"lm", "k", "dv", "dt"}
-ANALYSIS_COMMANDS = {"!analyze", "!thread", "!process"}
-MEMORY_COMMANDS = {"dd", "dq", "dp", "da", "du"}
-EXECUTION_COMMANDS = {"g", "p", "t", "bp", "bc"}
+QUICK_COMMANDS = frozenset({"version", "help", "?", "r"})
+NORMAL_COMMANDS = frozenset({"lm", "k", "dv", "dt"})
+ANALYSIS_COMMANDS = frozenset({"!analyze", "!thread", "!process"})
+MEMORY_COMMANDS = frozenset({"dd", "dq", "dp", "da", "du"})
+EXECUTION_COMMANDS = frozenset({"g", "p", "t", "bp", "bc"})
 
 # Large operation commands that need extended timeouts
-BULK_COMMANDS = {"lm", "!dlls", "!handle", "!vm", "!address"}
-LARGE_ANALYSIS_COMMANDS = {"!analyze -v", "!thread -1", "!process -1"}
-PROCESS_LIST_COMMANDS = {"!process 0 0", "!process 0 7", "!process 0 1f"}
-STREAMING_COMMANDS = {"!for_each_process", "!for_each_thread", "!for_each_module"}
+BULK_COMMANDS = frozenset({"lm", "!dlls", "!handle", "!vm", "!address"})
+LARGE_ANALYSIS_COMMANDS = frozenset({"!analyze -v", "!thread -1", "!process -1"})
+PROCESS_LIST_COMMANDS = frozenset({"!process 0 0", "!process 0 7", "!process 0 1f"})
+STREAMING_COMMANDS = frozenset({"!for_each_process", "!for_each_thread", "!for_each_module"})
 
 # Symbol operations that need extended timeouts
-SYMBOL_OPERATIONS = {".reload", ".reload /f", ".reload -f", ".sympath", ".symfix"}
+SYMBOL_OPERATIONS = frozenset({".reload", ".reload /f", ".reload -f", ".sympath", ".symfix"})
 
 # Commands that need very long timeouts (symbol loading, etc.)
-EXTENDED_TIMEOUT_COMMANDS = {".reload /f", ".reload -f"}
+EXTENDED_TIMEOUT_COMMANDS = frozenset({".reload /f", ".reload -f"})
 
 # Kernel-mode compatible commands for health checks
-KERNEL_HEALTH_COMMANDS = ["version", "!pcr", ".effmach"]
+KERNEL_HEALTH_COMMANDS = frozenset({"version", "!pcr", ".effmach"})
 
 # ====================================================================
 # LOGGING CONFIGURATION
@@ -168,6 +206,63 @@ VERBOSE_LOGGING = False
 # UTILITY FUNCTIONS
 # ====================================================================
 
+# Category sets in precedence order (most specific first) with their timeout field
+_TIMEOUT_CATEGORY_ORDER = (
+    (EXTENDED_TIMEOUT_COMMANDS, "extended"),
+    (SYMBOL_OPERATIONS, "symbols"),
+    (PROCESS_LIST_COMMANDS, "process_list"),
+    (STREAMING_COMMANDS, "streaming"),
+    (LARGE_ANALYSIS_COMMANDS, "large_analysis"),
+    (BULK_COMMANDS, "bulk"),
+    (QUICK_COMMANDS, "quick"),
+    (ANALYSIS_COMMANDS, "analysis"),
+    (MEMORY_COMMANDS, "memory"),
+    (EXECUTION_COMMANDS, "execution"),
+)
+_PRIORITY_CATEGORIES = tuple(field for _, field in _TIMEOUT_CATEGORY_ORDER)
+
+# Each pattern keeps the priority of the first category that lists it
+_PATTERN_PRIORITY = {
+    pattern: priority
+    for priority, (patterns, _) in reversed(list(enumerate(_TIMEOUT_CATEGORY_ORDER)))
+    for pattern in patterns
+}
+
+# One multi-pattern scan: the zero-width lookahead reports a match at every
+# position (so overlapping patterns are all seen), and ordering alternatives by
+# priority makes each position yield its highest-priority pattern
+_TIMEOUT_PATTERN_RE = re.compile("(?=({}))".format("|".join(
+    re.escape(pattern)
+    for pattern in sorted(_PATTERN_PRIORITY, key=lambda p: (_PATTERN_PRIORITY[p], -len(p)))
+)))
+
+def _scan_timeout_category(cmd_lower: str) -> str:
+    """Resolve the timeout category for a normalized command by precedence."""
+    best = len(_PRIORITY_CATEGORIES)
+    for match in _TIMEOUT_PATTERN_RE.finditer(cmd_lower):
+        priority = _PATTERN_PRIORITY[match.group(1)]
+        if priority < best:
+            best = priority
+            if priority == 0:
+                break
+    
+    if best == len(_PRIORITY_CATEGORIES):
+        return "normal"
+    return _PRIORITY_CATEGORIES[best]
+
+# Categories for every command listed in the category sets, precomputed with
+# the same precedence as the scan so exact matches need a single dict lookup
+COMMAND_CATEGORY_MAP = {
+    cmd: _scan_timeout_category(cmd)
+    for category in (
+        EXTENDED_TIMEOUT_COMMANDS, SYMBOL_OPERATIONS, PROCESS_LIST_COMMANDS,
+        STREAMING_COMMANDS, LARGE_ANALYSIS_COMMANDS, BULK_COMMANDS, QUICK_COMMANDS,
+        ANALYSIS_COMMANDS, MEMORY_COMMANDS, EXECUTION_COMMANDS, NORMAL_COMMANDS
+    )
+    for cmd in category
+}
+
+@lru_cache(maxsize=1024)
 def get_timeout_for_command(command: str, mode: DebuggingMode = DebuggingMode.LOCAL) -> int:
     """
     Get appropriate timeout for a command based on its type and debugging mode.
@@ -179,53 +274,40 @@ def get_timeout_for_command(command: str, mode: DebuggingMode = DebuggingMode.LO
     Returns:
         Timeout in milliseconds
     """
-    # Determine base timeout by command type
+    # Determine timeout category by command type
     cmd_lower = command.lower().strip()
+    category = COMMAND_CATEGORY_MAP.get(cmd_lower)
+    if category is None:
+        category = _scan_timeout_category(cmd_lower)
     
-    # Check for extended timeout commands first (most specific)
-    if any(ext_cmd in cmd_lower for ext_cmd in EXTENDED_TIMEOUT_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.extended
-    # Check for symbol operations
-    elif any(sym_cmd in cmd_lower for sym_cmd in SYMBOL_OPERATIONS):
-        base_timeout = DEFAULT_TIMEOUTS.symbols
-    # Check for process list commands
-    elif any(proc_cmd in cmd_lower for proc_cmd in PROCESS_LIST_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.process_list
-    # Check for streaming commands
-    elif any(stream_cmd in cmd_lower for stream_cmd in STREAMING_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.streaming
-    # Check for large analysis commands
-    elif any(large_cmd in cmd_lower for large_cmd in LARGE_ANALYSIS_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.large_analysis
-    # Check for bulk commands
-    elif any(bulk_cmd in cmd_lower for bulk_cmd in BULK_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.bulk
-    # Check for quick commands
-    elif any(quick_cmd in cmd_lower for quick_cmd in QUICK_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.quick
-    # Check for analysis commands
-    elif any(analysis_cmd in cmd_lower for analysis_cmd in ANALYSIS_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.analysis
-    # Check for memory commands
-    elif any(memory_cmd in cmd_lower for memory_cmd in MEMORY_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.memory
-    # Check for execution commands
-    elif any(exec_cmd in cmd_lower for exec_cmd in EXECUTION_COMMANDS):
-        base_timeout = DEFAULT_TIMEOUTS.execution
-    else:
-        base_timeout = DEFAULT_TIMEOUTS.normal
-    
-    # Apply mode-specific multiplier
-    multiplier = TIMEOUT_MULTIPLIERS.get(mode, 1.0)
-    final_timeout = int(base_timeout * multiplier)
+    # Look up the mode-adjusted timeout; unknown modes use the base timeout
+    final_timeout = FINAL_TIMEOUTS.get((category, mode))
+    if final_timeout is None:
+        final_timeout = getattr(DEFAULT_TIMEOUTS, category)
     
-    # Log timeout decision for debugging
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Timeout for '{command}': {final_timeout}ms (base: {base_timeout}ms, multiplier: {multiplier})")
+    # Log timeout decision for debugging (only on cache misses)
+    logger.debug("Timeout for '%s': %dms (category: %s, mode: %s)",
+                 command, final_timeout, category, mode)
     
     return final_timeout
 
+# Maximum delay between retries, in seconds
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+def _retry_delay(attempt: int, base_delay: int, exponential: bool) -> float:
+    if exponential:
+        delay_ms = base_delay * (2 ** attempt)
+    else:
+        delay_ms = base_delay * (attempt + 1)
+    
+    return min(delay_ms / 1000.0, MAX_RETRY_DELAY_SECONDS)
+
+# Backoff schedule for the default retry config; later attempts stay at the cap
+_DEFAULT_RETRY_DELAYS = tuple(
+    _retry_delay(attempt, DEFAULT_RETRY_CONFIG.base_delay_ms, DEFAULT_RETRY_CONFIG.exponential_backoff)
+    for attempt in range(16)
+)
+
 def get_retry_delay(attempt: int, base_delay: int = None, exponential: bool = None) -> float:
     """
     Calculate retry delay based on attempt number.
@@ -243,29 +325,55 @@ def get_retry_delay(attempt: int, base_delay: int = None, exponential: bool = No
     if exponential is None:
         exponential = DEFAULT_RETRY_CONFIG.exponential_backoff
     
-    if exponential:
-        delay_ms = base_delay * (2 ** attempt)
-    else:
-        delay_ms = base_delay * (attempt + 1)
+    if (base_delay == DEFAULT_RETRY_CONFIG.base_delay_ms and
+            exponential == DEFAULT_RETRY_CONFIG.exponential_backoff and attempt >= 0):
+        return _DEFAULT_RETRY_DELAYS[min(attempt, len(_DEFAULT_RETRY_DELAYS) - 1)]
     
-    return min(delay_ms / 1000.0, 30.0)  # Cap at 30 seconds
+    return _retry_delay(attempt, base_delay, exponential)
 
 def is_kernel_health_command(command: str) -> bool:
     """Check if command is suitable for kernel-mode health checking."""
     return command.lower() in KERNEL_HEALTH_COMMANDS
 
+# Leading command token of a ';'-separated segment, after any thread prefix
+# such as ~*, ~3 or ~. (so "~*g" and "~3 p" resolve to "g" and "p")
+_COMMAND_TOKEN_RE = re.compile(r"\s*(?:~(?:\*|\.|#|\d+)\s*)?(\.?[a-z]+)")
+# User-mode process switch such as "|1s" or "|# s"
+_PROCESS_SWITCH_RE = re.compile(r"\s*\|\s*(?:\d+|\.|#)?\s*s\s*$")
+
+def invalidates_command_cache(command: str) -> bool:
+    """Check if any segment of a (possibly chained) command invalidates cached output."""
+    for segment in command.lower().split(";"):
+        if _PROCESS_SWITCH_RE.match(segment):
+            return True
+        match = _COMMAND_TOKEN_RE.match(segment)
+        if not match:
+            continue
+        token = match.group(1)
+        if token in CACHE_INVALIDATING_COMMANDS:
+            return True
+        if token in CACHE_INVALIDATING_CONTEXT_COMMANDS and segment[match.end():].strip():
+            return True
+    return False
+
 # ====================================================================
 # ENVIRONMENT DETECTION
 # ====================================================================
 
-def load_environment_config():
-    """Load configuration from environment variables."""
+_TRUE_ENV_VALUES = frozenset({"1", "true", "yes", "on"})
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean flag from the environment."""
     import os
     
+    return os.environ.get(name, "").strip().lower() in _TRUE_ENV_VALUES
+
+def load_environment_config():
+    """Load configuration from environment variables."""
     global DEBUG_ENABLED, VERBOSE_LOGGING, LOG_LEVEL
     
-    DEBUG_ENABLED = os.environ.get("DEBUG", "false").lower() == "true"
-    VERBOSE_LOGGING = os.environ.get("VERBOSE", "false").lower() == "true"
+    DEBUG_ENABLED = _env_flag("DEBUG")
+    VERBOSE_LOGGING = _env_flag("VERBOSE")
     
     if DEBUG_ENABLED:
         LOG_LEVEL = "DEBUG"
@@ -5,6 +5,7 @@ This module provides the core components for communication, validation,
 context management, error handling, parameter hints, connection
 resilience, session recovery, performance optimization, and async operations.
 """
+from importlib import import_module
 
 from .communication import (
     send_command,
@@ -61,6 +62,9 @@ from .hints import (
     ToolInfo
 )
 
+# The session_recovery instance shares its name with the core.session_recovery
+# submodule. Importing it eagerly binds the instance here for good; a lazy
+# export would be shadowed by the submodule if that were imported first.
 from .session_recovery import (
     capture_current_session,
     check_session_health,
@@ -76,36 +80,48 @@ from .session_recovery import (
     RecoveryContext
 )
 
-from .performance import (
-    stream_large_command,
-    get_performance_report,
-    set_optimization_level,
-    clear_performance_caches,
-    performance_optimizer,
-    PerformanceOptimizer,
-    OptimizationLevel,
-    DataCompressor,
-    StreamingHandler,
-    CommandOptimizer,
-    PerformanceMetrics,
-    DataSize
-)
+# Performance and async support are heavier (background threads, optimizer
+# state), so their exports are imported on first access
+_LAZY_EXPORTS = {
+    **dict.fromkeys((
+        "stream_large_command",
+        "get_performance_report",
+        "set_optimization_level",
+        "clear_performance_caches",
+        "performance_optimizer",
+        "PerformanceOptimizer",
+        "OptimizationLevel",
+        "DataCompressor",
+        "StreamingHandler",
+        "CommandOptimizer",
+        "PerformanceMetrics",
+        "DataSize"
+    ), ".performance"),
+    **dict.fromkeys((
+        "submit_async_command",
+        "get_async_result",
+        "execute_parallel_commands",
+        "start_async_monitoring",
+        "stop_async_monitoring",
+        "get_async_stats",
+        "async_manager",
+        "batch_executor",
+        "AsyncOperationManager",
+        "BatchCommandExecutor",
+        "TaskStatus",
+        "TaskPriority",
+        "AsyncTask"
+    ), ".async_ops")
+}
 
-from .async_ops import (
-    submit_async_command,
-    get_async_result,
-    execute_parallel_commands,
-    start_async_monitoring,
-    stop_async_monitoring,
-    get_async_stats,
-    async_manager,
-    batch_executor,
-    AsyncOperationManager,
-    BatchCommandExecutor,
-    TaskStatus,
-    TaskPriority,
-    AsyncTask
-)
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Communication
@@ -5,13 +5,59 @@ This module provides the BatchCommandExecutor class that handles
 specialized batch operations like diagnostic sequences and performance analysis.
 """
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Iterable, Tuple
 from datetime import datetime
 
-from .task_manager import AsyncOperationManager, TaskStatus
+from .task_manager import AsyncOperationManager, AsyncTask, TaskStatus
 
 logger = logging.getLogger(__name__)
 
+# Command batches and their parallelism, keyed by analysis type
+_BATCHES: Dict[str, Tuple[Tuple[str, ...], int]] = {
+    "diagnostic": (
+        ("version", ".effmach", "!pcr", "lm", "!process -1 0", "k", "r"),
+        3
+    ),
+    "performance": (
+        ("!analyze -v", "!process 0 0", "!handle 0 f", "!vm", "!poolused"),
+        2  # These commands can be resource intensive
+    ),
+    "crash": (
+        ("!analyze -v", ".bugcheck", "k", "!thread", "!process", "lm"),
+        2
+    ),
+    "memory": (
+        ("!vm", "!poolused", "!heap -s", "!address", "!pte", "!pfn"),
+        2
+    ),
+    "system_info": (
+        ("version", ".effmach", "!cpuinfo", "!sysinfo", "lm", "!drivers", "!object"),
+        3
+    )
+}
+
+# Fixed guidance added to each analysis report type
+_ANALYSIS_RECOMMENDATIONS = {
+    "crash": (
+        "🔍 Review !analyze output for crash cause",
+        "📊 Check call stack (k command) for crash context"
+    ),
+    "performance": (
+        "📈 Compare current values with baseline performance",
+        "🎯 Focus on high resource usage areas"
+    ),
+    "memory": (
+        "💾 Check for memory leaks in pool usage",
+        "🔧 Analyze heap corruption if present"
+    )
+}
+
+def _preview(result: Optional[str], limit: int) -> Optional[str]:
+    """Return result truncated to limit characters, marking truncation with '...'."""
+    if result is None or len(result) <= limit:
+        return result
+    return result[:limit] + "..."
+
 class BatchCommandExecutor:
     """Specialized executor for batch command operations."""
     
@@ -20,167 +66,149 @@ class BatchCommandExecutor:
     
     def execute_diagnostic_sequence(self) -> Dict[str, Any]:
         """Execute a comprehensive diagnostic command sequence."""
-        diagnostic_commands = [
-            "version",
-            ".effmach", 
-            "!pcr",
-            "lm",
-            "!process -1 0",
-            "k",
-            "r"
-        ]
+        diagnostic_commands, max_parallel = _BATCHES["diagnostic"]
         
         logger.info("Starting diagnostic sequence")
-        results = self.async_manager.execute_parallel_commands(
+        results = self.async_manager.iter_parallel_commands(
             diagnostic_commands,
-            max_parallel=3
+            max_parallel=max_parallel
         )
         
-        # Process results into a structured report
+        # Build the report as tasks finish rather than after the whole batch
+        report_results = {}
+        successful_commands = 0
+        
+        for command, task in results:
+            status = task.status
+            started, completed = task.started_ts, task.completed_ts
+            result = task.result
+            
+            if status is TaskStatus.COMPLETED:
+                successful_commands += 1
+            
+            report_results[command] = {
+                "status": status.value,
+                "execution_time": completed - started if started is not None and completed is not None else 0.0,
+                "result_preview": _preview(result, 200),
+                "error": task.error
+            }
+        
         report = {
             "diagnostic_time": datetime.now().isoformat(),
             "commands_executed": len(diagnostic_commands),
-            "successful_commands": sum(1 for task in results.values() if task.status == TaskStatus.COMPLETED),
-            "results": {}
+            "successful_commands": successful_commands,
+            "results": report_results
         }
         
-        for command, task in results.items():
-            report["results"][command] = {
-                "status": task.status.value,
-                "execution_time": (task.completed_at - task.started_at).total_seconds() if task.started_at and task.completed_at else 0,
-                "result_preview": task.result[:200] + "..." if task.result and len(task.result) > 200 else task.result,
-                "error": task.error
-            }
-        
         return report
     
-    def execute_performance_analysis(self) -> Dict[str, Any]:
-        """Execute commands for performance analysis."""
-        performance_commands = [
-            "!analyze -v",
-            "!process 0 0",
-            "!handle 0 f", 
-            "!vm",
-            "!poolused"
-        ]
-        
-        logger.info("Starting performance analysis")
-        results = self.async_manager.execute_parallel_commands(
-            performance_commands,
-            max_parallel=2  # These commands can be resource intensive
+    def run_analysis(self, analysis_type: str) -> Dict[str, Any]:
+        """
+        Execute the command batch registered for analysis_type in _BATCHES.
+        
+        Args:
+            analysis_type: Batch name, e.g. "performance", "crash", "memory"
+            
+        Returns:
+            Structured analysis report
+        """
+        commands, max_parallel = _BATCHES[analysis_type]
+        
+        logger.info("Starting %s analysis", analysis_type.replace("_", " "))
+        results = self.async_manager.iter_parallel_commands(
+            commands,
+            max_parallel=max_parallel
         )
         
-        return self._format_analysis_results(results, "performance")
+        return self._format_analysis_results(results, analysis_type)
+    
+    def execute_performance_analysis(self) -> Dict[str, Any]:
+        """Execute commands for performance analysis."""
+        return self.run_analysis("performance")
     
     def execute_crash_analysis(self) -> Dict[str, Any]:
         """Execute commands for crash analysis."""
-        crash_commands = [
-            "!analyze -v",
-            ".bugcheck",
-            "k",
-            "!thread",
-            "!process",
-            "lm"
-        ]
-        
-        logger.info("Starting crash analysis")
-        results = self.async_manager.execute_parallel_commands(
-            crash_commands,
-            max_parallel=2
-        )
-        
-        return self._format_analysis_results(results, "crash")
+        return self.run_analysis("crash")
     
     def execute_memory_analysis(self) -> Dict[str, Any]:
         """Execute commands for memory analysis."""
-        memory_commands = [
-            "!vm",
-            "!poolused",
-            "!heap -s",
-            "!address",
-            "!pte",
-            "!pfn"
-        ]
-        
-        logger.info("Starting memory analysis")
-        results = self.async_manager.execute_parallel_commands(
-            memory_commands,
-            max_parallel=2
-        )
-        
-        return self._format_analysis_results(results, "memory")
+        return self.run_analysis("memory")
     
     def execute_system_info_batch(self) -> Dict[str, Any]:
         """Execute system information gathering commands."""
-        system_commands = [
-            "version",
-            ".effmach",
-            "!cpuinfo",
-            "!sysinfo",
-            "lm",
-            "!drivers",
-            "!object"
-        ]
-        
-        logger.info("Starting system information gathering")
-        results = self.async_manager.execute_parallel_commands(
-            system_commands,
-            max_parallel=3
-        )
-        
-        return self._format_analysis_results(results, "system_info")
+        return self.run_analysis("system_info")
     
-    def _format_analysis_results(self, results: Dict[str, any], analysis_type: str) -> Dict[str, Any]:
-        """Format analysis results into a structured report."""
+    def _format_analysis_results(
+        self,
+        results: Iterable[Tuple[str, AsyncTask]],
+        analysis_type: str
+    ) -> Dict[str, Any]:
+        """Format (command, task) pairs into a structured report as they arrive."""
+        tasks = {}
+        formatted_results = {}
+        successful = failed = 0
+        total_execution_time = 0.0
+        
+        # Aggregate the summary and per-command entries in one pass
+        for command, task in results:
+            tasks[command] = task
+            status = task.status
+            started, completed = task.started_ts, task.completed_ts
+            result = task.result
+            
+            execution_time = completed - started if started is not None and completed is not None else 0.0
+            total_execution_time += execution_time
+            
+            if status is TaskStatus.COMPLETED:
+                successful += 1
+            elif status is TaskStatus.FAILED:
+                failed += 1
+            
+            formatted_results[command] = {
+                "status": status.value,
+                "success": status is TaskStatus.COMPLETED,
+                "execution_time": execution_time,
+                "data_size": len(result) if result else 0,
+                "error": task.error,
+                "result_preview": _preview(result, 500)
+            }
+        
         return {
             "analysis_type": analysis_type,
             "timestamp": datetime.now().isoformat(),
             "summary": {
-                "total_commands": len(results),
-                "successful": sum(1 for task in results.values() if task.status == TaskStatus.COMPLETED),
-                "failed": sum(1 for task in results.values() if task.status == TaskStatus.FAILED),
-                "total_execution_time": sum(
-                    (task.completed_at - task.started_at).total_seconds()
-                    for task in results.values() 
-                    if task.started_at and task.completed_at
-                )
-            },
-            "results": {
-                command: {
-                    "status": task.status.value,
-                    "success": task.status == TaskStatus.COMPLETED,
-                    "execution_time": (task.completed_at - task.started_at).total_seconds() if task.started_at and task.completed_at else 0,
-                    "data_size": len(task.result) if task.result else 0,
-                    "error": task.error,
-                    "result_preview": task.result[:500] + "..." if task.result and len(task.result) > 500 else task.result
-                }
-                for command, task in results.items()
+                "total_commands": len(tasks),
+                "successful": successful,
+                "failed": failed,
+                "total_execution_time": total_execution_time
             },
-            "recommendations": self._get_analysis_recommendations(results, analysis_type)
+            "results": formatted_results,
+            "recommendations": self._get_analysis_recommendations(tasks, analysis_type, failed)
         }
     
-    def _get_analysis_recommendations(self, results: Dict[str, any], analysis_type: str) -> List[str]:
+    def _get_analysis_recommendations(
+        self,
+        results: Dict[str, any],
+        analysis_type: str,
+        failed_count: Optional[int] = None
+    ) -> List[str]:
         """Get recommendations based on analysis results."""
         recommendations = []
         
-        failed_count = sum(1 for task in results.values() if task.status == TaskStatus.FAILED)
+        if failed_count is None:
+            failed_count = sum(1 for task in results.values() if task.status is TaskStatus.FAILED)
         success_rate = (len(results) - failed_count) / len(results) if results else 0
         
         if success_rate < 0.5:
             recommendations.append("⚠️ High failure rate - check WinDbg connection and VM state")
         
-        if analysis_type == "crash":
-            if any("!analyze" in cmd for cmd in results.keys()):
-                recommendations.append("🔍 Review !analyze output for crash cause")
-                recommendations.append("📊 Check call stack (k command) for crash context")
-        elif analysis_type == "performance":
-            recommendations.append("📈 Compare current values with baseline performance")
-            recommendations.append("🎯 Focus on high resource usage areas")
-        elif analysis_type == "memory":
-            recommendations.append("💾 Check for memory leaks in pool usage")
-            recommendations.append("🔧 Analyze heap corruption if present")
+        type_recommendations = _ANALYSIS_RECOMMENDATIONS.get(analysis_type, ())
+        # Crash guidance points at !analyze output, which is absent if it never finished
+        if analysis_type == "crash" and not any("!analyze" in cmd for cmd in results):
+            type_recommendations = ()
+        recommendations.extend(type_recommendations)
         
         if not recommendations:
             recommendations.append("✅ Analysis completed successfully")
         
-        return recommendations 
\ No newline at end of file
+        return recommendations
@@ -5,15 +5,19 @@ This module provides the AsyncMonitor class that handles background
 monitoring of task queues, performance metrics, and health checking.
 """
 import logging
-import time
 import threading
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+from datetime import datetime
 
-from .task_manager import AsyncOperationManager, TaskStatus
+from .task_manager import AsyncOperationManager, _TERMINAL_STATUSES
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of task deletions per lock acquisition during cleanup
+_CLEANUP_BATCH_SIZE = 256
+
 class AsyncMonitor:
     """Handles background monitoring of async operations."""
     
@@ -21,8 +25,10 @@ class AsyncMonitor:
         self.async_manager = async_manager
         self._monitoring_enabled = False
         self._monitor_thread = None
-        self._stats_history = []
+        self._wake = threading.Event()
         self._max_history_size = 100
+        self._stats_history = deque(maxlen=self._max_history_size)
+        self._history_lock = threading.Lock()
     
     def start_monitoring(self):
         """Start background monitoring of task queue and performance."""
@@ -30,6 +36,7 @@ class AsyncMonitor:
             return
         
         self._monitoring_enabled = True
+        self._wake.clear()
         self._monitor_thread = threading.Thread(
             target=self._monitoring_loop,
             daemon=True,
@@ -41,6 +48,7 @@ class AsyncMonitor:
     def stop_monitoring(self):
         """Stop background monitoring."""
         self._monitoring_enabled = False
+        self._wake.set()  # Interrupt the current wait so the thread exits promptly
         if self._monitor_thread:
             self._monitor_thread.join(timeout=5.0)
         # Don't log during shutdown to avoid I/O errors with closed streams
@@ -49,6 +57,10 @@ class AsyncMonitor:
         except:
             pass  # Silently ignore if streams are closed
     
+    def nudge(self):
+        """Run the next monitoring cycle now instead of at the end of the interval."""
+        self._wake.set()
+    
     def get_monitoring_report(self) -> Dict[str, Any]:
         """Get comprehensive monitoring report."""
         current_stats = self.async_manager.get_statistics()
@@ -68,78 +80,97 @@ class AsyncMonitor:
             "recommendations": self._get_monitoring_recommendations(current_stats, health)
         }
     
-    def cleanup_completed_tasks(self, max_age_hours: int = 1):
-        """Clean up old completed tasks."""
-        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+    def cleanup_completed_tasks(self, max_age_hours: int = 1, now: Optional[float] = None):
+        """Clean up old completed tasks; now is a time.monotonic() reading."""
+        cutoff_ts = (time.monotonic() if now is None else now) - max_age_hours * 3600.0
         
+        # Copy the table under the lock and filter outside it, so task
+        # submission and completion are only blocked for the copy
         with self.async_manager._lock:
-            completed_tasks = [
-                task_id for task_id, task in self.async_manager.tasks.items()
-                if task.completed_at and task.completed_at < cutoff_time
-                and task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]
-            ]
-            
-            for task_id in completed_tasks:
-                del self.async_manager.tasks[task_id]
-        
-        logger.debug(f"Cleaned up {len(completed_tasks)} old tasks")
+            tasks = list(self.async_manager.tasks.items())
+        
+        completed_tasks = [
+            task_id for task_id, task in tasks
+            if task.completed_ts is not None and task.completed_ts < cutoff_ts
+            and task.status in _TERMINAL_STATUSES
+        ]
+        
+        # Delete in bounded batches; terminal tasks never change state, and a
+        # task removed in the meantime is simply skipped
+        for start in range(0, len(completed_tasks), _CLEANUP_BATCH_SIZE):
+            with self.async_manager._lock:
+                for task_id in completed_tasks[start:start + _CLEANUP_BATCH_SIZE]:
+                    self.async_manager.tasks.pop(task_id, None)
+        
+        logger.debug("Cleaned up %d old tasks", len(completed_tasks))
         return len(completed_tasks)
     
     def _monitoring_loop(self):
         """Background monitoring loop."""
+        cycle = 0
+        last_signature = None
+        
         while self._monitoring_enabled:
             try:
-                # Collect current statistics
-                stats = self.async_manager.get_statistics()
-                stats["timestamp"] = datetime.now().isoformat()
-                
-                # Add to history
-                self._stats_history.append(stats)
-                if len(self._stats_history) > self._max_history_size:
-                    self._stats_history.pop(0)
-                
-                # Clean up old tasks periodically
-                if len(self._stats_history) % 10 == 0:  # Every 10th cycle
-                    self.cleanup_completed_tasks()
+                now = datetime.now()
+                now_ts = time.monotonic()
+                cycle += 1
                 
-                # Log statistics periodically
-                if stats["total_tasks"] > 0:
-                    logger.debug(f"Async stats: {stats['running_tasks']} running, "
-                               f"{stats['pending_tasks']} pending, "
-                               f"{stats['success_rate']:.2f} success rate")
+                # Only snapshot when tasks were submitted, changed state or were
+                # cleaned up; idle cycles would add identical history rows
+                signature = (self.async_manager.state_version, len(self.async_manager.tasks))
+                if signature != last_signature:
+                    last_signature = signature
+                    
+                    # Collect current statistics
+                    stats = self.async_manager.get_statistics()
+                    stats["timestamp"] = now
+                    
+                    # Add to history (the deque drops the oldest entry when full)
+                    with self._history_lock:
+                        self._stats_history.append(stats)
+                    
+                    # Log statistics periodically
+                    if stats["total_tasks"] > 0:
+                        logger.debug("Async stats: %d running, %d pending, %.2f success rate",
+                                     stats["running_tasks"], stats["pending_tasks"], stats["success_rate"])
+                    
+                    # Check for potential issues
+                    self._check_for_issues(stats)
                 
-                # Check for potential issues
-                self._check_for_issues(stats)
+                # Clean up old tasks periodically; tasks age out even when idle
+                if cycle % 10 == 0:  # Every 10th cycle
+                    self.cleanup_completed_tasks(now=now_ts)
                 
-                time.sleep(30.0)  # Check every 30 seconds
+                self._wait_for_next_cycle()  # Check every 30 seconds
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(30.0)
+                self._wait_for_next_cycle()
+    
+    def _wait_for_next_cycle(self, interval: float = 30.0):
+        """Sleep until the next cycle, returning early when stopped or nudged."""
+        if self._wake.wait(interval):
+            self._wake.clear()
     
     def _calculate_trends(self) -> Dict[str, Any]:
         """Calculate trends from historical data."""
-        if len(self._stats_history) < 2:
+        # Snapshot under the lock; copying a deque while the monitor thread
+        # appends raises RuntimeError, and deques don't support slicing
+        with self._history_lock:
+            history = list(self._stats_history)
+        if len(history) < 2:
             return {"available": False, "reason": "insufficient_data"}
         
-        recent = self._stats_history[-5:]  # Last 5 data points
-        older = self._stats_history[-10:-5] if len(self._stats_history) >= 10 else self._stats_history[:-5]
+        recent = history[-5:]  # Last 5 data points
+        older = history[-10:-5] if len(history) >= 10 else history[:-5]
         
         if not older:
             return {"available": False, "reason": "insufficient_history"}
         
         # Calculate averages
-        recent_avg = {
-            "success_rate": sum(s["success_rate"] for s in recent) / len(recent),
-            "avg_execution_time": sum(s["average_execution_time"] for s in recent) / len(recent),
-            "running_tasks": sum(s["running_tasks"] for s in recent) / len(recent)
-        }
-        
-        older_avg = {
-            "success_rate": sum(s["success_rate"] for s in older) / len(older),
-            "avg_execution_time": sum(s["average_execution_time"] for s in older) / len(older),
-            "running_tasks": sum(s["running_tasks"] for s in older) / len(older)
-        }
+        recent_avg = self._average_stats(recent)
+        older_avg = self._average_stats(older)
         
         return {
             "available": True,
@@ -149,8 +180,26 @@ class AsyncMonitor:
             "interpretation": self._interpret_trends(recent_avg, older_avg)
         }
     
+    def _average_stats(self, history: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Average the trend fields of a non-empty history window in one pass."""
+        success_rate = execution_time = running_tasks = 0.0
+        for stats in history:
+            success_rate += stats["success_rate"]
+            execution_time += stats["average_execution_time"]
+            running_tasks += stats["running_tasks"]
+        
+        count = len(history)
+        return {
+            "success_rate": success_rate / count,
+            "avg_execution_time": execution_time / count,
+            "running_tasks": running_tasks / count
+        }
+    
     def _assess_health(self, stats: Dict[str, Any]) -> Dict[str, Any]:
         """Assess the health of async operations."""
+        success_rate = stats["success_rate"]
+        pending_tasks = stats["pending_tasks"]
+        
         health = {
             "overall": "healthy",
             "issues": [],
@@ -158,10 +207,10 @@ class AsyncMonitor:
         }
         
         # Check success rate
-        if stats["success_rate"] < 0.5:
+        if success_rate < 0.5:
             health["issues"].append("Low success rate (< 50%)")
             health["overall"] = "unhealthy"
-        elif stats["success_rate"] < 0.8:
+        elif success_rate < 0.8:
             health["warnings"].append("Moderate success rate (< 80%)")
             if health["overall"] == "healthy":
                 health["overall"] = "warning"
@@ -173,13 +222,13 @@ class AsyncMonitor:
                 health["overall"] = "warning"
         
         # Check queue buildup
-        if stats["pending_tasks"] > 10:
+        if pending_tasks > 10:
             health["warnings"].append("High pending task count (> 10)")
             if health["overall"] == "healthy":
                 health["overall"] = "warning"
         
         # Check for stuck tasks
-        if stats["running_tasks"] == stats["concurrent_peak"] and stats["pending_tasks"] > 0:
+        if stats["running_tasks"] == stats["concurrent_peak"] and pending_tasks > 0:
             health["issues"].append("Possible task queue bottleneck")
             health["overall"] = "unhealthy"
         
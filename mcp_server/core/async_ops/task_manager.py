@@ -4,17 +4,19 @@ Asynchronous task management for WinDbg commands.
 This module provides the core AsyncOperationManager class that handles
 task submission, execution, tracking, and result management.
 """
+import itertools
 import logging
 import time
 import threading
 import queue
-from typing import Dict, Any, List, Optional, Callable, Tuple
-from dataclasses import dataclass
-from datetime import datetime
-from enum import Enum
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Tuple, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum, IntEnum
 from concurrent.futures import ThreadPoolExecutor, Future
 
-from core.execution import execute_command
+from core.execution import execute_command, is_command_cached
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +28,20 @@ class TaskStatus(Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
-class TaskPriority(Enum):
+class TaskPriority(IntEnum):
     """Priority levels for async tasks."""
     LOW = 1
     NORMAL = 2
     HIGH = 3
     CRITICAL = 4
 
-@dataclass
+# Task states that will not change again
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+
+# Priority levels in the order the task processor drains them
+_DEQUEUE_ORDER = tuple(sorted(TaskPriority, reverse=True))
+
+@dataclass(slots=True)
 class AsyncTask:
     """Represents an async task."""
     task_id: str
@@ -41,23 +49,41 @@ class AsyncTask:
     status: TaskStatus
     priority: TaskPriority
     created_at: datetime
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    created_ts: float = field(default_factory=time.monotonic)  # time.monotonic() at submit
+    started_ts: Optional[float] = None  # time.monotonic() at start
+    completed_ts: Optional[float] = None  # time.monotonic() at completion
     result: Optional[str] = None
     error: Optional[str] = None
     metadata: Dict[str, Any] = None
     timeout_category: str = "normal"
+    done_event: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
     
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
+    
+    @property
+    def started_at(self) -> Optional[datetime]:
+        """Wall-clock start time, derived from the monotonic timestamps."""
+        return self._wall_time(self.started_ts)
+    
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        """Wall-clock completion time, derived from the monotonic timestamps."""
+        return self._wall_time(self.completed_ts)
+    
+    def _wall_time(self, ts: Optional[float]) -> Optional[datetime]:
+        if ts is None:
+            return None
+        return self.created_at + timedelta(seconds=ts - self.created_ts)
 
 class AsyncOperationManager:
     """Manages asynchronous operations for WinDbg commands."""
     
-    def __init__(self, max_workers: int = 5, max_concurrent: int = 3):
+    def __init__(self, max_workers: int = 5, max_concurrent: int = 3, max_history: int = 10000):
         self.max_workers = max_workers
         self.max_concurrent = max_concurrent
+        self.max_history = max_history
         self.executor = ThreadPoolExecutor(
             max_workers=max_workers,
             thread_name_prefix="AsyncWinDbg"
@@ -65,10 +91,18 @@ class AsyncOperationManager:
         
         # Task management
         self.tasks: Dict[str, AsyncTask] = {}
-        self.task_queue: queue.PriorityQueue = queue.PriorityQueue()
+        # One FIFO per priority level; deque append/popleft are thread-safe
+        self._queues: Dict[TaskPriority, deque] = {priority: deque() for priority in TaskPriority}
+        self._queued_items = threading.Semaphore(0)
         self.running_tasks: Dict[str, Future] = {}
-        self._task_counter = 0
+        self._task_counter = itertools.count(1)
+        self._pending_count = 0
+        self._state_version = 0
         self._lock = threading.Lock()
+        # Notified (under _lock) whenever a task reaches a terminal state
+        self._task_done = threading.Condition(self._lock)
+        # One permit per concurrently running task
+        self._slots = threading.BoundedSemaphore(max_concurrent)
         
         # Performance tracking
         self.stats = {
@@ -76,11 +110,18 @@ class AsyncOperationManager:
             "completed_tasks": 0,
             "failed_tasks": 0,
             "average_execution_time": 0.0,
-            "concurrent_peak": 0
+            "concurrent_peak": 0,
+            "success_rate": 0.0,
+            "failure_rate": 0.0
         }
+        self._ema_initialized = False
         
         # Task processor
         self._processor_running = False
+        
+        # Completion callbacks run on their own thread, off the workers
+        self._callback_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._callback_worker_running = False
     
     def submit_command(
         self,
@@ -101,9 +142,8 @@ class AsyncOperationManager:
         Returns:
             Task ID for tracking
         """
-        with self._lock:
-            self._task_counter += 1
-            task_id = f"task_{self._task_counter}_{int(time.time())}"
+        # next() on itertools.count is atomic, so IDs need no lock
+        task_id = f"task_{next(self._task_counter)}_{int(time.time())}"
         
         task = AsyncTask(
             task_id=task_id,
@@ -117,19 +157,27 @@ class AsyncOperationManager:
         
         with self._lock:
             self.tasks[task_id] = task
+            self._pending_count += 1
             self.stats["total_tasks"] += 1
+            self._update_rates()
+            self._state_version += 1
         
-        # Add to priority queue (lower number = higher priority)
-        priority_value = 5 - priority.value  # Invert so higher enum value = higher priority
-        self.task_queue.put((priority_value, time.time(), task_id))
+        # Queue on the task's priority level and wake the processor
+        self._queues[priority].append(task_id)
+        self._queued_items.release()
         
-        logger.debug(f"Submitted async task {task_id}: {command}")
+        logger.debug("Submitted async task %s: %s", task_id, command)
         
         # Start processing if not already running
         self._start_task_processor()
         
         return task_id
     
+    @property
+    def state_version(self) -> int:
+        """Counter bumped on every task submission or status change."""
+        return self._state_version
+    
     def get_task_status(self, task_id: str) -> Optional[AsyncTask]:
         """Get the status of a specific task."""
         with self._lock:
@@ -146,24 +194,18 @@ class AsyncOperationManager:
         Returns:
             Task result or None if not completed/failed
         """
-        start_time = time.time()
+        with self._lock:
+            task = self.tasks.get(task_id)
         
-        while True:
-            with self._lock:
-                task = self.tasks.get(task_id)
-            
-            if not task:
-                return None
-            
-            if task.status == TaskStatus.COMPLETED:
-                return task.result
-            elif task.status in [TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                return None
-            
-            if timeout and (time.time() - start_time) > timeout:
-                return None
-            
-            time.sleep(0.1)  # Small delay before checking again
+        if not task:
+            return None
+        
+        # Block until the task reaches a terminal state (or the timeout expires)
+        task.done_event.wait(timeout or None)
+        
+        if task.status is TaskStatus.COMPLETED:
+            return task.result
+        return None
     
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending or running task."""
@@ -172,19 +214,31 @@ class AsyncOperationManager:
             if not task:
                 return False
             
-            if task.status == TaskStatus.PENDING:
+            if task.status is TaskStatus.PENDING:
                 task.status = TaskStatus.CANCELLED
-                task.completed_at = datetime.now()
+                task.completed_ts = time.monotonic()
+                self._pending_count -= 1
+                self._state_version += 1
+                task.done_event.set()
+                self._task_done.notify_all()
                 return True
-            elif task.status == TaskStatus.RUNNING:
-                # Try to cancel the running future
-                future = self.running_tasks.get(task_id)
-                if future and future.cancel():
-                    task.status = TaskStatus.CANCELLED
-                    task.completed_at = datetime.now()
-                    return True
+            if task.status is not TaskStatus.RUNNING:
+                return False
+            future = self.running_tasks.get(task_id)
         
-        return False
+        # Future.cancel() runs _task_completed on this thread, which takes
+        # _lock, so it must be called after the lock is released
+        if not future or not future.cancel():
+            return False
+        
+        with self._lock:
+            if task.status is TaskStatus.RUNNING:
+                task.status = TaskStatus.CANCELLED
+                task.completed_ts = time.monotonic()
+                self._state_version += 1
+                task.done_event.set()
+                self._task_done.notify_all()
+        return True
     
     def execute_parallel_commands(
         self,
@@ -201,56 +255,81 @@ class AsyncOperationManager:
         Returns:
             Dictionary mapping commands to their task results
         """
+        return dict(self.iter_parallel_commands(commands, max_parallel))
+    
+    def iter_parallel_commands(
+        self,
+        commands: Sequence[str],
+        max_parallel: int = None
+    ) -> Iterator[Tuple[str, AsyncTask]]:
+        """
+        Execute multiple commands in parallel, yielding results as they finish.
+        
+        Tasks still unfinished after the wait window are cancelled and yielded
+        last. Closing the generator early cancels the remaining tasks.
+        
+        Args:
+            commands: List of commands to execute
+            max_parallel: Maximum parallel executions (default: max_concurrent)
+            
+        Yields:
+            (command, task) pairs in completion order
+        """
         max_parallel = max_parallel or self.max_concurrent
         
         # Submit all commands
-        task_ids = []
+        pending = []
         for command in commands:
             task_id = self.submit_command(command, TaskPriority.HIGH)
-            task_ids.append(task_id)
+            task = self.get_task_status(task_id)
+            if task:
+                pending.append(task)
         
-        # Wait for all to complete
-        results = {}
+        # Hand back each task as soon as it finishes
         timeout = 120.0  # 2 minutes max wait
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         
-        while task_ids and (time.time() - start_time) < timeout:
-            completed_ids = []
-            
-            for task_id in task_ids:
-                task = self.get_task_status(task_id)
-                if task and task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                    results[task.command] = task
-                    completed_ids.append(task_id)
-            
-            for task_id in completed_ids:
-                task_ids.remove(task_id)
-            
-            if task_ids:
-                time.sleep(0.2)
+        try:
+            while pending:
+                still_pending = []
+                for task in pending:
+                    if task.done_event.is_set():
+                        yield task.command, task
+                    else:
+                        still_pending.append(task)
+                pending = still_pending
+                
+                remaining = deadline - time.monotonic()
+                if not pending or remaining <= 0:
+                    break
+                
+                # Sleep until one of our tasks finishes; the predicate runs under _lock
+                with self._task_done:
+                    self._task_done.wait_for(
+                        lambda: any(task.done_event.is_set() for task in pending),
+                        remaining
+                    )
+        except GeneratorExit:
+            for task in pending:
+                self.cancel_task(task.task_id)
+            raise
         
         # Cancel any remaining tasks
-        for task_id in task_ids:
-            self.cancel_task(task_id)
-            task = self.get_task_status(task_id)
-            if task:
-                results[task.command] = task
-        
-        return results
+        for task in pending:
+            self.cancel_task(task.task_id)
+            yield task.command, task
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get async operation statistics."""
         with self._lock:
             running_count = len(self.running_tasks)
-            pending_count = sum(1 for task in self.tasks.values() if task.status == TaskStatus.PENDING)
+            pending_count = self._pending_count
             
             stats = self.stats.copy()
             stats.update({
                 "running_tasks": running_count,
                 "pending_tasks": pending_count,
-                "total_managed_tasks": len(self.tasks),
-                "success_rate": stats["completed_tasks"] / max(stats["total_tasks"], 1),
-                "failure_rate": stats["failed_tasks"] / max(stats["total_tasks"], 1)
+                "total_managed_tasks": len(self.tasks)
             })
         
         return stats
@@ -268,45 +347,61 @@ class AsyncOperationManager:
     def _task_processor_loop(self):
         """Main task processing loop."""
         while True:
+            # Block until a concurrency slot frees up, then wait for the next task
+            self._slots.acquire()
+            started = False
             try:
-                # Check if we can start more tasks
-                with self._lock:
-                    current_running = len(self.running_tasks)
+                self._queued_items.acquire()
+                task_id = self._next_queued_task_id()
                 
-                if current_running >= self.max_concurrent:
-                    time.sleep(0.1)
-                    continue
-                
-                # Get next task from queue
-                try:
-                    priority, submit_time, task_id = self.task_queue.get(timeout=1.0)
-                except queue.Empty:
-                    continue
-                
-                # Check if task still exists and is pending
                 with self._lock:
                     task = self.tasks.get(task_id)
-                    if not task or task.status != TaskStatus.PENDING:
-                        continue
+                if not task:
+                    continue
                 
-                # Start the task
-                self._execute_task(task)
+                # Start the task; _task_completed returns the slot
+                started = self._execute_task(task)
                 
             except Exception as e:
                 logger.error(f"Error in task processor loop: {e}")
                 time.sleep(1.0)
+            finally:
+                if not started:
+                    self._slots.release()
+    
+    def _next_queued_task_id(self) -> str:
+        """Pop the oldest task ID from the highest non-empty priority level."""
+        for priority in _DEQUEUE_ORDER:
+            task_queue = self._queues[priority]
+            if task_queue:
+                return task_queue.popleft()
+        raise RuntimeError("Task queue signalled but empty")
     
-    def _execute_task(self, task: AsyncTask):
-        """Execute a single task."""
+    def _execute_task(self, task: AsyncTask) -> bool:
+        """Execute a single task; returns False if it was no longer pending."""
         with self._lock:
+            # Checked under the same lock as the transition so a concurrent
+            # cancel_task cannot be overwritten
+            if task.status is not TaskStatus.PENDING:
+                return False
             task.status = TaskStatus.RUNNING
-            task.started_at = datetime.now()
+            self._pending_count -= 1
+            task.started_ts = time.monotonic()
+            self._state_version += 1
             
             # Update peak concurrent tasks
             running_count = len(self.running_tasks) + 1
             if running_count > self.stats["concurrent_peak"]:
                 self.stats["concurrent_peak"] = running_count
         
+        # Cache hits return in microseconds; run them on this thread instead
+        # of paying for a pool handoff and completion callback
+        if is_command_cached(task.command):
+            future = Future()
+            future.set_result(self._run_command(task))
+            self._task_completed(task.task_id, future)
+            return True
+        
         # Submit to thread pool
         future = self.executor.submit(self._run_command, task)
         
@@ -315,6 +410,29 @@ class AsyncOperationManager:
         
         # Add completion callback
         future.add_done_callback(lambda f: self._task_completed(task.task_id, f))
+        return True
+    
+    def _update_rates(self):
+        """Refresh the success/failure rates in stats (caller holds _lock)."""
+        stats = self.stats
+        total = max(stats["total_tasks"], 1)
+        stats["success_rate"] = stats["completed_tasks"] / total
+        stats["failure_rate"] = stats["failed_tasks"] / total
+    
+    def _trim_history(self):
+        """Evict the oldest finished tasks beyond max_history (caller holds _lock)."""
+        excess = len(self.tasks) - self.max_history
+        # Dicts keep insertion order, so the oldest submissions come first
+        evicted = []
+        for task_id, task in self.tasks.items():
+            if task.status in _TERMINAL_STATUSES:
+                evicted.append(task_id)
+                if len(evicted) >= excess:
+                    break
+        
+        for task_id in evicted:
+            del self.tasks[task_id]
+        self._state_version += 1
     
     def _run_command(self, task: AsyncTask) -> Tuple[bool, str, Dict[str, Any]]:
         """Run the actual command for a task."""
@@ -351,39 +469,54 @@ class AsyncOperationManager:
     
     def _task_completed(self, task_id: str, future: Future):
         """Handle task completion."""
+        # Unpack the outcome before taking the lock; cancel_task itself
+        # finalizes tasks whose future was cancelled
+        completed_ts = time.monotonic()
+        if future.cancelled():
+            success, result, metadata = None, None, None
+        else:
+            try:
+                success, result, metadata = future.result()
+            except Exception as e:
+                success, result, metadata = False, str(e), None
+        
         with self._lock:
+            # Remove from running tasks and hand the slot back to the processor
+            self.running_tasks.pop(task_id, None)
+            self._slots.release()
+            
             task = self.tasks.get(task_id)
-            if not task:
+            if not task or success is None:
                 return
             
-            # Remove from running tasks
-            self.running_tasks.pop(task_id, None)
+            self._state_version += 1
             
             # Update task with results
-            task.completed_at = datetime.now()
-            
-            try:
-                success, result, metadata = future.result()
-                if success:
-                    task.status = TaskStatus.COMPLETED
-                    task.result = result
-                    task.metadata.update(metadata)
-                    self.stats["completed_tasks"] += 1
-                else:
-                    task.status = TaskStatus.FAILED
-                    task.error = result
-                    task.metadata.update(metadata)
-                    self.stats["failed_tasks"] += 1
-                    
-            except Exception as e:
+            task.completed_ts = completed_ts
+            if metadata:
+                task.metadata.update(metadata)
+            if success:
+                task.status = TaskStatus.COMPLETED
+                task.result = result
+                self.stats["completed_tasks"] += 1
+            else:
                 task.status = TaskStatus.FAILED
-                task.error = str(e)
+                task.error = result
                 self.stats["failed_tasks"] += 1
+            self._update_rates()
+            
+            # Wake get_task_result and iter_parallel_commands waiters
+            task.done_event.set()
+            self._task_done.notify_all()
+            
+            if len(self.tasks) > self.max_history:
+                self._trim_history()
             
             # Update average execution time
-            execution_time = (task.completed_at - task.started_at).total_seconds()
-            if self.stats["average_execution_time"] == 0:
+            execution_time = completed_ts - task.started_ts
+            if not self._ema_initialized:
                 self.stats["average_execution_time"] = execution_time
+                self._ema_initialized = True
             else:
                 # Exponential moving average
                 alpha = 0.1
@@ -392,10 +525,24 @@ class AsyncOperationManager:
                     (1 - alpha) * self.stats["average_execution_time"]
                 )
             
-            # Call callback if provided
+            # Hand the callback to the callback thread so a slow one cannot
+            # hold up this worker or other completions
             callback = task.metadata.get("callback")
             if callback and callable(callback):
-                try:
-                    callback(task)
-                except Exception as e:
-                    logger.error(f"Error in task callback: {e}") 
\ No newline at end of file
+                self._callback_queue.put((callback, task))
+                if not self._callback_worker_running:
+                    self._callback_worker_running = True
+                    threading.Thread(
+                        target=self._callback_loop,
+                        daemon=True,
+                        name="TaskCallbacks"
+                    ).start()
+    
+    def _callback_loop(self):
+        """Run completion callbacks in completion order."""
+        while True:
+            callback, task = self._callback_queue.get()
+            try:
+                callback(task)
+            except Exception as e:
+                logger.error(f"Error in task callback: {e}")
@@ -5,13 +5,33 @@ This module provides utility functions for task management,
 insights generation, and async operation helpers.
 """
 import logging
+import re
+import time
+from collections import Counter
 from typing import Dict, Any, List
-from datetime import datetime, timedelta
 
 from .task_manager import AsyncTask, TaskStatus, TaskPriority
 
 logger = logging.getLogger(__name__)
 
+# Command categories in precedence order with their substring markers
+_COMMAND_CATEGORIES = (
+    ("crash_analysis", ("!analyze", "!crash", ".bugcheck")),
+    ("process_analysis", ("!process", "!thread", "!handle")),
+    ("memory_analysis", ("!vm", "!pool", "!heap", "!pte")),
+    ("stack_trace", ("k", "kb", "kv", "kp")),
+    ("registers", ("r", "rm", "rf")),
+    ("system_info", ("lm", "version", ".effmach")),
+    ("execution_control", ("g", "p", "t", "bp", "bc"))
+)
+
+# One capture group per category inside a lookahead, so a single scan finds
+# the matching categories at every offset; group N is _COMMAND_CATEGORIES[N - 1]
+_COMMAND_CATEGORY_RE = re.compile("(?=(?:{}))".format("|".join(
+    "({})".format("|".join(re.escape(marker) for marker in markers))
+    for _, markers in _COMMAND_CATEGORIES
+)))
+
 class TaskUtilities:
     """Utility functions for async task management."""
     
@@ -23,15 +43,15 @@ class TaskUtilities:
     @staticmethod
     def filter_tasks_by_timeframe(tasks: Dict[str, AsyncTask], hours: int) -> List[AsyncTask]:
         """Filter tasks created within the specified timeframe."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        return [task for task in tasks.values() if task.created_at >= cutoff_time]
+        cutoff_ts = time.monotonic() - hours * 3600.0
+        return [task for task in tasks.values() if task.created_ts >= cutoff_ts]
     
     @staticmethod
     def get_task_execution_time(task: AsyncTask) -> float:
         """Get the execution time of a task in seconds."""
-        if not task.started_at or not task.completed_at:
+        if task.started_ts is None or task.completed_ts is None:
             return 0.0
-        return (task.completed_at - task.started_at).total_seconds()
+        return task.completed_ts - task.started_ts
     
     @staticmethod
     def get_tasks_by_command_pattern(tasks: Dict[str, AsyncTask], pattern: str) -> List[AsyncTask]:
@@ -50,13 +70,13 @@ class TaskUtilities:
                 "total_execution_time": 0.0
             }
         
-        completed_tasks = [t for t in tasks if t.status == TaskStatus.COMPLETED]
-        failed_tasks = [t for t in tasks if t.status == TaskStatus.FAILED]
+        completed_tasks = [t for t in tasks if t.status is TaskStatus.COMPLETED]
+        failed_tasks = [t for t in tasks if t.status is TaskStatus.FAILED]
         
         execution_times = [
             TaskUtilities.get_task_execution_time(task) 
             for task in tasks 
-            if task.started_at and task.completed_at
+            if task.started_ts is not None and task.completed_ts is not None
         ]
         
         return {
@@ -92,30 +112,40 @@ class TaskUtilities:
         elif stats["average_execution_time"] > 10.0:
             insights["performance_insights"].append("🐌 Slow average execution time (>10s)")
         
-        # Command insights
-        command_patterns = {}
-        for task in tasks.values():
-            cmd_type = TaskUtilities._categorize_command(task.command)
-            if cmd_type not in command_patterns:
-                command_patterns[cmd_type] = {"count": 0, "success": 0}
-            command_patterns[cmd_type]["count"] += 1
-            if task.status == TaskStatus.COMPLETED:
-                command_patterns[cmd_type]["success"] += 1
-        
-        for cmd_type, data in command_patterns.items():
-            success_rate = data["success"] / data["count"] if data["count"] > 0 else 0
-            if data["count"] >= 5:  # Only report on patterns with enough data
+        # Command and timing insights from a single pass over a snapshot of
+        # the task table (the manager may add tasks while we iterate)
+        completed = TaskStatus.COMPLETED
+        categorize = TaskUtilities._categorize_command
+        cutoff_ts = time.monotonic() - 3600.0  # Last hour
+        type_counts = Counter()
+        type_successes = Counter()
+        recent_count = 0
+        recent_times = []
+        
+        for task in list(tasks.values()):
+            cmd_type = categorize(task.command)
+            type_counts[cmd_type] += 1
+            if task.status is completed:
+                type_successes[cmd_type] += 1
+            
+            if task.created_ts >= cutoff_ts:
+                recent_count += 1
+                started, finished = task.started_ts, task.completed_ts
+                if started is not None and finished is not None:
+                    recent_times.append(finished - started)
+        
+        for cmd_type, count in type_counts.items():
+            success_rate = type_successes[cmd_type] / count
+            if count >= 5:  # Only report on patterns with enough data
                 insights["command_insights"].append(
-                    f"📊 {cmd_type}: {data['count']} executions, {success_rate:.1%} success rate"
+                    f"📊 {cmd_type}: {count} executions, {success_rate:.1%} success rate"
                 )
         
-        # Timing insights
-        recent_tasks = TaskUtilities.filter_tasks_by_timeframe(tasks, 1)  # Last hour
-        if recent_tasks:
-            recent_metrics = TaskUtilities.calculate_task_metrics(recent_tasks)
+        if recent_count:
+            recent_average = sum(recent_times) / len(recent_times) if recent_times else 0.0
             insights["timing_insights"].append(
-                f"📈 Last hour: {recent_metrics['count']} tasks, "
-                f"{recent_metrics['average_execution_time']:.1f}s avg time"
+                f"📈 Last hour: {recent_count} tasks, "
+                f"{recent_average:.1f}s avg time"
             )
         
         # Recommendations
@@ -133,33 +163,23 @@ class TaskUtilities:
     @staticmethod
     def _categorize_command(command: str) -> str:
         """Categorize a command by type."""
-        command_lower = command.lower().strip()
-        
-        if any(cmd in command_lower for cmd in ["!analyze", "!crash", ".bugcheck"]):
-            return "crash_analysis"
-        elif any(cmd in command_lower for cmd in ["!process", "!thread", "!handle"]):
-            return "process_analysis"
-        elif any(cmd in command_lower for cmd in ["!vm", "!pool", "!heap", "!pte"]):
-            return "memory_analysis"
-        elif any(cmd in command_lower for cmd in ["k", "kb", "kv", "kp"]):
-            return "stack_trace"
-        elif any(cmd in command_lower for cmd in ["r", "rm", "rF"]):
-            return "registers"
-        elif any(cmd in command_lower for cmd in ["lm", "version", ".effmach"]):
-            return "system_info"
-        elif any(cmd in command_lower for cmd in ["g", "p", "t", "bp", "bc"]):
-            return "execution_control"
-        else:
-            return "general"
+        best = None
+        for match in _COMMAND_CATEGORY_RE.finditer(command.lower().strip()):
+            if best is None or match.lastindex < best:
+                best = match.lastindex
+                if best == 1:
+                    break
+        
+        return _COMMAND_CATEGORIES[best - 1][0] if best else "general"
     
     @staticmethod
     def format_task_summary(task: AsyncTask) -> str:
         """Format a concise summary of a task."""
         duration = ""
-        if task.started_at and task.completed_at:
+        if task.started_ts is not None and task.completed_ts is not None:
             duration = f" ({TaskUtilities.get_task_execution_time(task):.1f}s)"
-        elif task.started_at:
-            running_time = (datetime.now() - task.started_at).total_seconds()
+        elif task.started_ts is not None:
+            running_time = time.monotonic() - task.started_ts
             duration = f" (running {running_time:.1f}s)"
         
         status_icon = {
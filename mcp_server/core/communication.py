@@ -5,13 +5,16 @@ This module provides all communication functionality including low-level protoco
 connection management, error handling, and diagnostic capabilities.
 """
 import json
+import re
 import time
 import logging
 import threading
-from typing import Dict, Any, Optional, List, Tuple
+import itertools
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from contextlib import contextmanager
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from enum import Enum
 import win32pipe
 import win32file
@@ -19,10 +22,46 @@ import win32api
 import win32event
 import pywintypes
 
-from config import PIPE_NAME, BUFFER_SIZE, DEFAULT_TIMEOUT_MS, DebuggingMode, get_timeout_for_command
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+from config import (
+    PIPE_NAME, BUFFER_SIZE, DEFAULT_TIMEOUT_MS, CACHEABLE_COMMANDS, DebuggingMode,
+    get_timeout_for_command, invalidates_command_cache
+)
+from .unified_cache import invalidate_command_cache
 
 logger = logging.getLogger(__name__)
 
+# Pipe payloads are parsed straight from bytes; orjson is used when installed.
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(message: Dict[str, Any]) -> bytes:
+        # The newline is written by orjson into the same output buffer
+        return orjson.dumps(message, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    # json.loads takes bytes and bytearray directly, without a decode copy
+    _json_loads = json.loads
+
+    def _json_dumps(message: Dict[str, Any]) -> bytes:
+        return (json.dumps(message) + "\n").encode('utf-8')
+
+# Request IDs; next() on itertools.count is atomic under the GIL, and small
+# values fit the C++ extension's int id field
+_message_ids = itertools.count(1)
+
+# Phrases in WinDbg output that indicate a flaky network debugging transport
+_NETWORK_ERROR_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in (
+        "retry sending", "transport connection", "lost", "network",
+        "target windows seems lost", "resync with target"
+    )),
+    re.IGNORECASE
+)
+
 
 # Exception Classes
 class CommunicationError(Exception):
@@ -55,15 +94,15 @@ class ConnectionHandle:
     """Represents a connection handle with metadata."""
     handle: Any
     created_at: datetime
-    last_used: datetime
+    last_used: float  # time.monotonic() reading
     in_use: bool = False
     use_count: int = 0
-    thread_id: int = 0
+    thread_id: int = 0  # Thread that acquired it most recently
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConnectionHealth:
-    """Represents the health status of the WinDbg connection."""
+    """Immutable snapshot of the WinDbg connection health."""
     is_connected: bool
     last_successful_command: Optional[datetime]
     consecutive_failures: int
@@ -98,10 +137,10 @@ class NamedPipeProtocol:
                 0,
                 None,
                 win32file.OPEN_EXISTING,
-                0,
+                win32file.FILE_FLAG_OVERLAPPED,
                 None
             )
-            logger.debug(f"Connected to pipe: {pipe_name}")
+            logger.debug("Connected to pipe: %s", pipe_name)
             return handle
             
         except pywintypes.error as e:
@@ -111,8 +150,8 @@ class NamedPipeProtocol:
                 raise ConnectionError("WinDbg extension not found. Make sure the extension is loaded in WinDbg.")
             elif error_code == 231:  # ERROR_PIPE_BUSY
                 # Wait for pipe to become available
-                start_time = time.time()
-                while (time.time() - start_time) * 1000 < timeout_ms:
+                deadline = time.monotonic() + timeout_ms / 1000.0
+                while time.monotonic() < deadline:
                     if win32pipe.WaitNamedPipe(pipe_name, min(5000, timeout_ms)):
                         try:
                             handle = win32file.CreateFile(
@@ -121,10 +160,10 @@ class NamedPipeProtocol:
                                 0,
                                 None,
                                 win32file.OPEN_EXISTING,
-                                0,
+                                win32file.FILE_FLAG_OVERLAPPED,
                                 None
                             )
-                            logger.debug(f"Connected to pipe after waiting: {pipe_name}")
+                            logger.debug("Connected to pipe after waiting: %s", pipe_name)
                             return handle
                         except pywintypes.error as retry_error:
                             if retry_error.args[0] != 231:
@@ -137,53 +176,94 @@ class NamedPipeProtocol:
             else:
                 raise ConnectionError(f"Failed to connect to WinDbg extension: {str(e)}")
     
+    @staticmethod
+    def _create_overlapped() -> Any:
+        """Create an OVERLAPPED structure with a manual-reset completion event."""
+        overlapped = pywintypes.OVERLAPPED()
+        overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        return overlapped
+    
+    @staticmethod
+    def _wait_for_overlapped(handle: Any, overlapped: Any, deadline: float, timeout_ms: int, operation: str) -> int:
+        """
+        Wait for an overlapped operation to finish before deadline.
+        
+        Returns:
+            Number of bytes transferred
+            
+        Raises:
+            TimeoutError: If the deadline passes; the operation is cancelled first
+        """
+        remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        if win32event.WaitForSingleObject(overlapped.hEvent, remaining_ms) != win32event.WAIT_OBJECT_0:
+            # Let the cancellation settle so the kernel no longer owns the buffer
+            win32file.CancelIo(handle)
+            try:
+                win32file.GetOverlappedResult(handle, overlapped, True)
+            except pywintypes.error:
+                pass
+            raise TimeoutError(f"{operation} operation timed out after {timeout_ms}ms")
+        return win32file.GetOverlappedResult(handle, overlapped, False)
+    
     @staticmethod
     def write_to_pipe(handle: Any, data: bytes, timeout_ms: int):
         """Write data to the pipe."""
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        overlapped = NamedPipeProtocol._create_overlapped()
         try:
-            win32file.WriteFile(handle, data)
-            logger.debug(f"Successfully wrote {len(data)} bytes to pipe")
+            win32file.WriteFile(handle, data, overlapped)
+            written = NamedPipeProtocol._wait_for_overlapped(handle, overlapped, deadline, timeout_ms, "Write")
+            logger.debug("Successfully wrote %d bytes to pipe", written)
         except pywintypes.error as e:
             raise ConnectionError(f"Failed to write to pipe: {str(e)}")
+        finally:
+            overlapped.hEvent.Close()
     
     @staticmethod
-    def read_from_pipe(handle: Any, timeout_ms: int) -> bytes:
-        """Read response from the pipe."""
-        start_time = datetime.now()
-        response_data = b''
+    def read_from_pipe(handle: Any, timeout_ms: int) -> bytearray:
+        """Read response from the pipe; the buffer is returned without copying."""
+        # Each read waits on the completion event in the kernel, bounded by the
+        # remaining time, instead of polling with sleeps
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        buffer = win32file.AllocateReadBuffer(BUFFER_SIZE)
+        overlapped = NamedPipeProtocol._create_overlapped()
+        # Accumulate in a bytearray; extending it is amortized O(1) per chunk
+        # whereas bytes concatenation copies the whole response every time.
+        response_data = bytearray()
+        # Checked once per response rather than once per chunk
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        while True:
-            elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-            if elapsed_ms > timeout_ms:
-                raise TimeoutError(f"Read operation timed out after {elapsed_ms}ms")
-            
-            try:
-                hr, data = win32file.ReadFile(handle, BUFFER_SIZE)
+        try:
+            while True:
+                try:
+                    win32file.ReadFile(handle, buffer, overlapped)
+                    read = NamedPipeProtocol._wait_for_overlapped(handle, overlapped, deadline, timeout_ms, "Read")
+                except pywintypes.error as e:
+                    error_code = e.args[0]
+                    if error_code == 109:  # ERROR_BROKEN_PIPE
+                        if response_data:
+                            logger.warning("Pipe broken but have partial data, using it")
+                            break
+                        raise ConnectionError("Pipe connection broken")
+                    elif error_code == 232:  # ERROR_NO_DATA
+                        if time.monotonic() > deadline:
+                            raise TimeoutError(f"Read operation timed out after {timeout_ms}ms")
+                        time.sleep(0.01)
+                        continue
+                    else:
+                        raise ConnectionError(f"Failed to read from pipe: {str(e)}")
                 
-                if data:
-                    response_data += data
-                    logger.debug(f"Read {len(data)} bytes, total: {len(response_data)} bytes")
+                if read:
+                    response_data += buffer[:read]
+                    if debug_enabled:
+                        logger.debug("Read %d bytes, total: %d bytes", read, len(response_data))
                     
-                    if response_data.endswith(b'\n'):
-                        logger.debug("Found complete response")
+                    if response_data[-1] == 0x0A:  # newline terminates a response
                         break
-                else:
-                    time.sleep(0.01)
-                    
-            except pywintypes.error as e:
-                error_code = e.args[0]
-                if error_code == 109:  # ERROR_BROKEN_PIPE
-                    if response_data:
-                        logger.warning("Pipe broken but have partial data, using it")
-                        break
-                    raise ConnectionError("Pipe connection broken")
-                elif error_code == 232:  # ERROR_NO_DATA
-                    time.sleep(0.01)
-                    continue
-                else:
-                    raise ConnectionError(f"Failed to read from pipe: {str(e)}")
+        finally:
+            overlapped.hEvent.Close()
         
-        logger.debug(f"Successfully read complete response: {len(response_data)} bytes")
+        logger.debug("Successfully read complete response: %d bytes", len(response_data))
         return response_data
     
     @staticmethod
@@ -205,7 +285,7 @@ class MessageProtocol:
         return {
             "type": "command",
             "command": "execute_command",
-            "id": int(time.time() * 1000),
+            "id": next(_message_ids),
             "args": {
                 "command": command,
                 "timeout_ms": timeout_ms
@@ -218,7 +298,7 @@ class MessageProtocol:
         message = {
             "type": "command",
             "command": handler_name,
-            "id": int(time.time() * 1000)
+            "id": next(_message_ids)
         }
         
         if kwargs:
@@ -230,20 +310,22 @@ class MessageProtocol:
     def serialize_message(message: Dict[str, Any]) -> bytes:
         """Serialize a message to bytes for transmission."""
         try:
-            message_str = json.dumps(message) + "\n"
-            return message_str.encode('utf-8')
+            return _json_dumps(message)
         except (TypeError, ValueError) as e:
             raise CommunicationError(f"Failed to serialize message: {e}")
     
     @staticmethod
-    def parse_response(response_data: bytes) -> Dict[str, Any]:
+    def parse_response(response_data: Union[bytes, bytearray]) -> Dict[str, Any]:
         """Parse the response data from the extension."""
+        # A full parse is deliberate: scanning the raw bytes for status/output
+        # with regexes is far slower than orjson on multi-MB outputs.
         try:
-            response_str = response_data.decode('utf-8').strip()
-            return json.loads(response_str)
+            # Trailing newline and whitespace are valid JSON, so the buffer
+            # from read_from_pipe is parsed as is, with no strip or decode
+            return _json_loads(response_data)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse response: {e}")
-            logger.debug(f"Raw response: {response_data!r}")
+            logger.debug("Raw response (%d bytes): %r...", len(response_data), response_data[:200])
             raise CommunicationError(f"Invalid response from WinDbg extension")
         except UnicodeDecodeError as e:
             logger.error(f"Failed to decode response: {e}")
@@ -274,12 +356,7 @@ class MessageProtocol:
     @staticmethod
     def detect_network_debugging_error(error_message: str) -> bool:
         """Detect if an error message indicates network debugging issues."""
-        network_error_indicators = [
-            "retry sending", "transport connection", "lost", "network",
-            "target windows seems lost", "resync with target"
-        ]
-        
-        return any(phrase in error_message.lower() for phrase in network_error_indicators)
+        return _NETWORK_ERROR_RE.search(error_message) is not None
 
 
 # Connection Pool Management
@@ -298,25 +375,29 @@ class ConnectionPool:
     @contextmanager
     def get_connection(self, timeout_ms: int = DEFAULT_TIMEOUT_MS):
         """Context manager to get a connection from the pool."""
-        start_time = time.time()
+        deadline = time.monotonic() + timeout_ms / 1000.0
         connection = None
         
         with self._lock:
-            if self._active_requests >= self._max_concurrent_requests:
-                while self._active_requests >= self._max_concurrent_requests:
-                    elapsed = (time.time() - start_time) * 1000
-                    if elapsed > timeout_ms:
-                        raise TimeoutError(f"Request timed out in queue after {elapsed:.0f}ms")
-                    
-                    wait_time = min(0.1, (timeout_ms - elapsed) / 1000)
-                    if not self._queue_condition.wait(wait_time):
-                        continue
+            # Releases notify the condition, so sleep until then or the deadline
+            while self._active_requests >= self._max_concurrent_requests:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Request timed out in queue after {timeout_ms}ms")
+                self._queue_condition.wait(remaining)
             
             self._active_requests += 1
         
         try:
             connection = self._acquire_connection(timeout_ms)
             yield connection.handle
+        except Exception:
+            # A failed or timed-out exchange leaves the pipe in an unknown state
+            # (a late response may still arrive), so never hand it out again.
+            if connection:
+                self._discard_connection(connection)
+                connection = None
+            raise
         finally:
             if connection:
                 self._release_connection(connection)
@@ -330,14 +411,22 @@ class ConnectionPool:
         current_thread = threading.get_ident()
         
         with self._lock:
+            # Prefer the idle connection this thread used last, so steady
+            # callers keep their own pipe instance instead of trading handles
+            idle = None
             for conn in self._connections:
                 if not conn.in_use:
-                    conn.in_use = True
-                    conn.last_used = datetime.now()
-                    conn.use_count += 1
-                    conn.thread_id = current_thread
-                    logger.debug(f"Reusing connection (use count: {conn.use_count})")
-                    return conn
+                    idle = conn
+                    if conn.thread_id == current_thread:
+                        break
+            
+            if idle is not None:
+                idle.in_use = True
+                idle.last_used = time.monotonic()
+                idle.use_count += 1
+                idle.thread_id = current_thread
+                logger.debug("Reusing connection (use count: %d)", idle.use_count)
+                return idle
             
             if len(self._connections) < self._max_connections:
                 try:
@@ -345,14 +434,16 @@ class ConnectionPool:
                     connection = ConnectionHandle(
                         handle=handle,
                         created_at=datetime.now(),
-                        last_used=datetime.now(),
+                        last_used=time.monotonic(),
                         in_use=True,
                         use_count=1,
                         thread_id=current_thread
                     )
                     self._connections.append(connection)
-                    logger.debug(f"Created new connection (total: {len(self._connections)})")
+                    logger.debug("Created new connection (total: %d)", len(self._connections))
                     return connection
+                except CommunicationError:
+                    raise
                 except Exception as e:
                     logger.error(f"Failed to create connection: {e}")
                     raise ConnectionError(f"Unable to create connection: {e}")
@@ -364,11 +455,13 @@ class ConnectionPool:
                 return ConnectionHandle(
                     handle=handle,
                     created_at=datetime.now(),
-                    last_used=datetime.now(),
+                    last_used=time.monotonic(),
                     in_use=True,
                     use_count=1,
                     thread_id=current_thread
                 )
+            except CommunicationError:
+                raise
             except Exception as e:
                 raise ConnectionError(f"Unable to acquire connection: {e}")
     
@@ -376,8 +469,8 @@ class ConnectionPool:
         """Release connection back to pool."""
         with self._lock:
             connection.in_use = False
-            connection.last_used = datetime.now()
-            connection.thread_id = 0
+            connection.last_used = time.monotonic()
+            # thread_id is kept as the last user for the affinity lookup
             
             if connection not in self._connections:
                 try:
@@ -386,6 +479,14 @@ class ConnectionPool:
                 except Exception as e:
                     logger.warning(f"Error closing temporary connection: {e}")
     
+    def _discard_connection(self, connection: ConnectionHandle):
+        """Drop a broken connection from the pool and close its handle."""
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        NamedPipeProtocol.close_pipe(connection.handle)
+        logger.debug("Discarded pooled connection (remaining: %d)", len(self._connections))
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get connection pool statistics."""
         with self._lock:
@@ -410,12 +511,55 @@ class CommunicationManager:
             extension_responsive=True,
             last_error=None
         )
+        # Serializes health updates; readers load the current snapshot without it
         self._health_lock = threading.Lock()
         self._connection_pool = ConnectionPool()
+        # Pending read-only commands, keyed by normalized command text
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
     
     def send_command(self, command: str, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> str:
         """Send a command to the WinDbg extension."""
-        logger.debug(f"Sending command: {command}")
+        # Running the target can change any cached command output; clear it
+        # on every path, including failures and timeouts mid-run
+        if invalidates_command_cache(command):
+            try:
+                return self._send_command(command, timeout_ms)
+            finally:
+                invalidate_command_cache()
+        
+        # Concurrent callers of the same read-only command share one round-trip
+        key = command.strip().lower()
+        if key not in CACHEABLE_COMMANDS:
+            return self._send_command(command, timeout_ms)
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            logger.debug("Joining in-flight command: %s", command)
+            try:
+                return future.result(timeout=timeout_ms / 1000.0)
+            except FutureTimeoutError:
+                raise TimeoutError(f"Command '{command}' timed out waiting for in-flight request")
+        
+        try:
+            result = self._send_command(command, timeout_ms)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _send_command(self, command: str, timeout_ms: int) -> str:
+        """Send a command over the pipe and unwrap its output."""
+        logger.debug("Sending command: %s", command)
         
         message = MessageProtocol.create_command_message(command, timeout_ms)
         
@@ -439,6 +583,10 @@ class CommunicationManager:
         except (TimeoutError, ConnectionError, NetworkDebuggingError):
             self._update_health_on_failure(f"Command '{command}' failed")
             raise
+        except CommunicationError as e:
+            # Already classified above; re-raise as is rather than wrapping twice
+            self._update_health_on_failure(str(e))
+            raise
         except Exception as e:
             self._update_health_on_failure(str(e))
             logger.error(f"Unexpected error executing command '{command}': {e}")
@@ -446,7 +594,7 @@ class CommunicationManager:
     
     def send_handler_command(self, handler_name: str, timeout_ms: int = DEFAULT_TIMEOUT_MS, **kwargs) -> Dict[str, Any]:
         """Send a direct handler command to the WinDbg extension."""
-        logger.debug(f"Sending handler command: {handler_name}")
+        logger.debug("Sending handler command: %s", handler_name)
         
         message = MessageProtocol.create_handler_message(handler_name, **kwargs)
         
@@ -466,6 +614,9 @@ class CommunicationManager:
         except (TimeoutError, ConnectionError):
             self._update_health_on_failure(f"Handler '{handler_name}' failed")
             raise
+        except CommunicationError as e:
+            self._update_health_on_failure(str(e))
+            raise
         except Exception as e:
             self._update_health_on_failure(str(e))
             logger.error(f"Unexpected error executing handler '{handler_name}': {e}")
@@ -478,33 +629,49 @@ class CommunicationManager:
             extension_responsive = bool(result.get("status") == "success")
             
             with self._health_lock:
-                self._connection_health.extension_responsive = extension_responsive
-                self._connection_health.is_connected = extension_responsive
+                health = self._connection_health
                 if extension_responsive:
-                    self._connection_health.last_successful_command = datetime.now()
-                    self._connection_health.consecutive_failures = 0
-                    self._connection_health.last_error = None
+                    self._connection_health = replace(
+                        health,
+                        extension_responsive=True,
+                        is_connected=True,
+                        last_successful_command=datetime.now(),
+                        consecutive_failures=0,
+                        last_error=None
+                    )
                 else:
-                    self._connection_health.consecutive_failures += 1
+                    self._connection_health = replace(
+                        health,
+                        extension_responsive=False,
+                        is_connected=False,
+                        consecutive_failures=health.consecutive_failures + 1
+                    )
             
             return extension_responsive
             
         except NetworkDebuggingError:
             logger.debug("Network debugging error during connection test - assuming connected")
             with self._health_lock:
-                self._connection_health.extension_responsive = True
-                self._connection_health.is_connected = True
-                self._connection_health.last_successful_command = datetime.now()
-                self._connection_health.consecutive_failures = 0
-                self._connection_health.last_error = None
+                self._connection_health = replace(
+                    self._connection_health,
+                    extension_responsive=True,
+                    is_connected=True,
+                    last_successful_command=datetime.now(),
+                    consecutive_failures=0,
+                    last_error=None
+                )
             return True
         except Exception as e:
             logger.debug(f"Connection test failed: {e}")
             with self._health_lock:
-                self._connection_health.extension_responsive = False
-                self._connection_health.is_connected = False
-                self._connection_health.consecutive_failures += 1
-                self._connection_health.last_error = str(e)
+                health = self._connection_health
+                self._connection_health = replace(
+                    health,
+                    extension_responsive=False,
+                    is_connected=False,
+                    consecutive_failures=health.consecutive_failures + 1,
+                    last_error=str(e)
+                )
             return False
     
     def test_target_connection(self) -> Tuple[bool, str]:
@@ -514,12 +681,13 @@ class CommunicationManager:
             target_responsive = bool(result and not result.startswith("Error:"))
             
             with self._health_lock:
-                self._connection_health.target_responsive = target_responsive
+                self._connection_health = replace(self._connection_health, target_responsive=target_responsive)
             
             if target_responsive:
-                if "kernel" in result.lower():
+                result_lower = result.lower()
+                if "kernel" in result_lower:
                     return True, "Kernel debugging target connected"
-                elif "user" in result.lower() or "process" in result.lower():
+                elif "user" in result_lower or "process" in result_lower:
                     return True, "User-mode debugging target connected"
                 else:
                     return True, "Debugging target connected"
@@ -528,11 +696,11 @@ class CommunicationManager:
                 
         except NetworkDebuggingError as e:
             with self._health_lock:
-                self._connection_health.target_responsive = False
+                self._connection_health = replace(self._connection_health, target_responsive=False)
             return False, f"Network debugging issue: {str(e)}"
         except Exception as e:
             with self._health_lock:
-                self._connection_health.target_responsive = False
+                self._connection_health = replace(self._connection_health, target_responsive=False)
             return False, f"Target test failed: {str(e)}"
     
     def diagnose_connection_issues(self) -> Dict[str, Any]:
@@ -546,7 +714,11 @@ class CommunicationManager:
         try:
             diagnostics["extension_available"] = self.test_connection()
             
-            target_connected, target_status = self.test_target_connection()
+            # Without a responsive extension the target probe can only time out
+            if diagnostics["extension_available"]:
+                target_connected, target_status = self.test_target_connection()
+            else:
+                target_connected, target_status = False, "Not tested (extension not responding)"
             diagnostics["target_connected"] = target_connected
             diagnostics["target_status"] = target_status
             
@@ -573,9 +745,10 @@ class CommunicationManager:
         return diagnostics
     
     def get_connection_health(self) -> ConnectionHealth:
-        """Get the current connection health status."""
-        with self._health_lock:
-            return self._connection_health
+        """Get the current connection health snapshot."""
+        # Snapshots are immutable and swapped in with one assignment, so a
+        # plain load is always consistent
+        return self._connection_health
     
     def get_connection_pool_stats(self) -> Dict[str, Any]:
         """Get connection pool statistics."""
@@ -583,10 +756,12 @@ class CommunicationManager:
     
     def _send_message(self, message: Dict[str, Any], timeout_ms: int) -> Dict[str, Any]:
         """Send a message to the WinDbg extension via named pipe."""
+        # Serialize once; the direct-connection fallback resends the same bytes
+        message_bytes = MessageProtocol.serialize_message(message)
+        
         try:
             with self._connection_pool.get_connection(timeout_ms) as handle:
-                message_bytes = MessageProtocol.serialize_message(message)
-                logger.debug(f"Sending {len(message_bytes)} bytes via pooled connection")
+                logger.debug("Sending %d bytes via pooled connection", len(message_bytes))
                 
                 NamedPipeProtocol.write_to_pipe(handle, message_bytes, timeout_ms)
                 response_data = NamedPipeProtocol.read_from_pipe(handle, timeout_ms)
@@ -594,11 +769,10 @@ class CommunicationManager:
                 return MessageProtocol.parse_response(response_data)
                 
         except Exception as pool_error:
-            logger.debug(f"Pooled connection failed, falling back to direct connection: {pool_error}")
+            logger.debug("Pooled connection failed, falling back to direct connection: %s", pool_error)
             
             handle = None
             try:
-                message_bytes = MessageProtocol.serialize_message(message)
                 handle = NamedPipeProtocol.connect_to_pipe(PIPE_NAME, timeout_ms)
                 
                 NamedPipeProtocol.write_to_pipe(handle, message_bytes, timeout_ms)
@@ -613,22 +787,36 @@ class CommunicationManager:
     def _update_health_on_success(self):
         """Update connection health when a command succeeds."""
         with self._health_lock:
-            self._connection_health.last_successful_command = datetime.now()
-            self._connection_health.consecutive_failures = 0
-            self._connection_health.last_error = None
-            self._connection_health.extension_responsive = True
-            self._connection_health.target_responsive = True
-            self._connection_health.is_connected = True
+            self._connection_health = replace(
+                self._connection_health,
+                last_successful_command=datetime.now(),
+                consecutive_failures=0,
+                last_error=None,
+                extension_responsive=True,
+                target_responsive=True,
+                is_connected=True
+            )
     
     def _update_health_on_failure(self, error_message: str):
         """Update connection health when a failure occurs."""
         with self._health_lock:
-            self._connection_health.consecutive_failures += 1
-            self._connection_health.last_error = error_message
-            
-            if self._connection_health.consecutive_failures >= 3:
-                self._connection_health.is_connected = False
-                self._connection_health.extension_responsive = False
+            health = self._connection_health
+            consecutive_failures = health.consecutive_failures + 1
+            
+            if consecutive_failures >= 3:
+                self._connection_health = replace(
+                    health,
+                    consecutive_failures=consecutive_failures,
+                    last_error=error_message,
+                    is_connected=False,
+                    extension_responsive=False
+                )
+            else:
+                self._connection_health = replace(
+                    health,
+                    consecutive_failures=consecutive_failures,
+                    last_error=error_message
+                )
 
 
 # Global Communication Manager Instance
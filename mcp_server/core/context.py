@@ -6,12 +6,20 @@ and thread contexts during debugging operations.
 """
 import logging
 import re
+import time
 from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from config import CONTEXT_CACHE_TTL_SECONDS
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_IMPLICIT_PROCESS_RE = re.compile(r'Implicit process is ([0-9a-fA-F`]+)')
+_CURRENT_THREAD_RE = re.compile(r'Current thread is ([0-9a-fA-F`]+)')
+
+_CONTEXT_PROBE_COMMAND = ".process; .thread"
+
+@dataclass(slots=True)
 class DebugContext:
     """Represents a debugging context state."""
     process_address: Optional[str] = None
@@ -29,44 +37,67 @@ class ContextManager:
     with proper restoration.
     """
     
-    def __init__(self):
+    def __init__(self, cache_ttl: float = CONTEXT_CACHE_TTL_SECONDS):
         self._context_stack = []
         self._current_context = DebugContext()
+        self._cache_ttl = cache_ttl
+        self._context_probed_at = None
+    
+    def invalidate_cache(self):
+        """Force the next save to re-query the debugger for the current context."""
+        self._context_probed_at = None
+    
+    def _cache_is_fresh(self) -> bool:
+        return (self._context_probed_at is not None and
+                time.monotonic() - self._context_probed_at < self._cache_ttl)
     
     def save_current_context(self, communication_func) -> DebugContext:
         """
         Save the current debugging context.
         
+        Back-to-back saves reuse the last known context for a short TTL
+        instead of issuing .process/.thread again.
+        
         Args:
             communication_func: Function to send commands (e.g., send_command)
             
         Returns:
             The saved context
         """
+        if self._current_context and self._cache_is_fresh():
+            logger.debug("Reusing cached debugging context")
+            return replace(self._current_context)
+        
         context = DebugContext()
         
         try:
+            # Query process and thread in one round trip; the two outputs use
+            # distinct phrases, so both can be parsed from the combined text
+            probe_result = communication_func(_CONTEXT_PROBE_COMMAND)
+            
             # Get current process context
-            process_result = communication_func(".process")
-            if process_result and "Implicit process is" in process_result:
-                match = re.search(r'Implicit process is ([0-9a-fA-F`]+)', process_result)
+            if probe_result and "Implicit process is" in probe_result:
+                match = _IMPLICIT_PROCESS_RE.search(probe_result)
                 if match:
                     context.process_address = match.group(1)
-                    logger.debug(f"Saved process context: {context.process_address}")
+                    logger.debug("Saved process context: %s", context.process_address)
             
-            # Get current thread context
-            thread_result = communication_func(".thread")
+            # Get current thread context, re-querying if the chain stopped early
+            thread_result = probe_result
+            if not thread_result or "Current thread is" not in thread_result:
+                thread_result = communication_func(".thread")
             if thread_result and "Current thread is" in thread_result:
-                match = re.search(r'Current thread is ([0-9a-fA-F`]+)', thread_result)
+                match = _CURRENT_THREAD_RE.search(thread_result)
                 if match:
                     context.thread_address = match.group(1)
-                    logger.debug(f"Saved thread context: {context.thread_address}")
+                    logger.debug("Saved thread context: %s", context.thread_address)
                     
         except Exception as e:
             logger.warning(f"Failed to save context: {e}")
             
         self._current_context = context
-        return context
+        self._context_probed_at = time.monotonic() if context else None
+        return replace(context)
     
     def push_context(self, communication_func) -> DebugContext:
         """
@@ -82,7 +113,7 @@ class ContextManager:
         saved_context = self.save_current_context(communication_func)
         if saved_context:
             self._context_stack.append(saved_context)
-            logger.debug(f"Pushed context to stack (depth: {len(self._context_stack)})")
+            logger.debug("Pushed context to stack (depth: %d)", len(self._context_stack))
         
         return saved_context
     
@@ -104,7 +135,7 @@ class ContextManager:
         success = self.restore_context(context, communication_func)
         
         if success:
-            logger.debug(f"Popped and restored context (stack depth: {len(self._context_stack)})")
+            logger.debug("Popped and restored context (stack depth: %d)", len(self._context_stack))
         
         return success
     
@@ -125,17 +156,29 @@ class ContextManager:
         success = True
         
         try:
+            # Restore both in a single round trip when both are known
+            if context.process_address and context.thread_address:
+                logger.debug("Restoring context to process %s, thread %s",
+                             context.process_address, context.thread_address)
+                result = communication_func(
+                    f".process /r /p {context.process_address}; .thread {context.thread_address}"
+                )
+                if not result or "failed" in result.lower():
+                    logger.warning(f"Failed to restore context to process {context.process_address}, "
+                                   f"thread {context.thread_address}")
+                    success = False
+            
             # Restore process context if available
-            if context.process_address:
-                logger.debug(f"Restoring process context to: {context.process_address}")
+            elif context.process_address:
+                logger.debug("Restoring process context to: %s", context.process_address)
                 result = communication_func(f".process /r /p {context.process_address}")
                 if not result or "failed" in result.lower():
                     logger.warning(f"Failed to restore process context to {context.process_address}")
                     success = False
             
             # Restore thread context if available
-            if context.thread_address:
-                logger.debug(f"Restoring thread context to: {context.thread_address}")
+            elif context.thread_address:
+                logger.debug("Restoring thread context to: %s", context.thread_address)
                 result = communication_func(f".thread {context.thread_address}")
                 if not result or "failed" in result.lower():
                     logger.warning(f"Failed to restore thread context to {context.thread_address}")
@@ -146,8 +189,15 @@ class ContextManager:
             success = False
         
         if success:
-            self._current_context = context
-            
+            self._current_context = replace(context)
+            # Only a fully specified context is known to match the debugger state
+            if context.process_address and context.thread_address:
+                self._context_probed_at = time.monotonic()
+            else:
+                self.invalidate_cache()
+        else:
+            self.invalidate_cache()
+        
         return success
     
     def switch_to_process(self, process_address: str, communication_func) -> bool:
@@ -162,11 +212,12 @@ class ContextManager:
             True if switch was successful, False otherwise
         """
         try:
-            logger.debug(f"Switching to process: {process_address}")
+            logger.debug("Switching to process: %s", process_address)
             result = communication_func(f".process /r /p {process_address}")
             
+            self.invalidate_cache()
             if result and "Implicit process is now" in result:
-                self._current_context.process_address = process_address
+                self._current_context = replace(self._current_context, process_address=process_address)
                 return True
             else:
                 logger.warning(f"Failed to switch to process {process_address}: {result}")
@@ -188,11 +239,12 @@ class ContextManager:
             True if switch was successful, False otherwise
         """
         try:
-            logger.debug(f"Switching to thread: {thread_address}")
+            logger.debug("Switching to thread: %s", thread_address)
             result = communication_func(f".thread {thread_address}")
             
+            self.invalidate_cache()
             if result and "Current thread is now" in result:
-                self._current_context.thread_address = thread_address
+                self._current_context = replace(self._current_context, thread_address=thread_address)
                 return True
             else:
                 logger.warning(f"Failed to switch to thread {thread_address}: {result}")
@@ -89,7 +89,7 @@ class ErrorEnhancer:
         self.current_context = context
         if state_info:
             self.debugging_state.update(state_info)
-        logger.debug(f"Updated debug context to: {context.value}")
+        logger.debug("Updated debug context to: %s", context.value)
     
     def enhance_parameter_error(self, tool_name: str, action: str, missing_param: str) -> EnhancedError:
         """Create error for missing/invalid parameters."""
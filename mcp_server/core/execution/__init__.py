@@ -13,7 +13,7 @@ from .executor import UnifiedCommandExecutor, ExecutionContext, ExecutionResult
 from .result import ExecutionMode
 from .strategies import (
     ExecutionStrategy, DirectStrategy, ResilientStrategy, 
-    OptimizedStrategy, AsyncStrategy
+    OptimizedStrategy, AsyncStrategy, is_command_cached
 )
 from .timeout_resolver import TimeoutResolver
 
@@ -72,4 +72,5 @@ __all__ = [
     'TimeoutResolver',
     'get_executor',
     'execute_command',
+    'is_command_cached',
 ]
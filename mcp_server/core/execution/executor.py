@@ -8,7 +8,7 @@ strategies and providing a consistent interface.
 import logging
 from typing import Dict, Any, Optional, Union
 
-from .result import ExecutionResult, ExecutionContext, create_execution_context
+from .result import ExecutionResult, ExecutionContext, ExecutionMode, create_execution_context, create_failure_result
 from .strategies import create_strategy, ExecutionStrategy
 from .timeout_resolver import get_timeout_resolver
 
@@ -55,7 +55,8 @@ class UnifiedCommandExecutor:
         if not command or not command.strip():
             return self._create_parameter_error("Command cannot be empty")
         
-        logger.debug(f"Unified execution: {command} (resilient={resilient}, optimize={optimize}, async={async_mode})")
+        logger.debug("Unified execution: %s (resilient=%s, optimize=%s, async=%s)",
+                     command, resilient, optimize, async_mode)
         
         try:
             # Create execution context
@@ -120,7 +121,7 @@ class UnifiedCommandExecutor:
                 "results": []
             }
         
-        logger.debug(f"Batch execution: {len(commands)} commands")
+        logger.debug("Batch execution: %d commands", len(commands))
         
         results = []
         successful_commands = 0
@@ -266,8 +267,6 @@ class UnifiedCommandExecutor:
     
     def _create_parameter_error(self, message: str) -> ExecutionResult:
         """Create a parameter validation error result."""
-        from .result import create_failure_result, ExecutionMode
-        
         return create_failure_result(
             error=f"Parameter error: {message}",
             execution_mode=ExecutionMode.DIRECT,
@@ -276,8 +275,6 @@ class UnifiedCommandExecutor:
     
     def _create_execution_error(self, command: str, error: str) -> ExecutionResult:
         """Create an execution error result."""
-        from .result import create_failure_result, ExecutionMode
-        
         return create_failure_result(
             error=f"Execution error: {error}",
             execution_mode=ExecutionMode.DIRECT,
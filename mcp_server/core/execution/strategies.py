@@ -12,12 +12,31 @@ from datetime import datetime
 
 from core.communication import send_command, CommunicationError, TimeoutError, ConnectionError
 from core.retry_utils import execute_with_retry, resilient_command
+from core.unified_cache import get_cached_command_result, cache_command_result, has_cached_command_result
+from config import CACHEABLE_COMMANDS
 # Direct execution with optimization
 from .result import ExecutionResult, ExecutionContext, ExecutionMode, create_success_result, create_failure_result
-from .timeout_resolver import get_timeout_resolver
+from .timeout_resolver import TimeoutResolver, get_timeout_resolver
 
 logger = logging.getLogger(__name__)
 
+def _send_and_record(
+    command: str,
+    timeout_ms: int,
+    category: str,
+    timeout_resolver: TimeoutResolver
+) -> str:
+    """
+    Send a single command attempt and feed its duration to adaptive timeouts.
+    
+    Only successful attempts are recorded: a timeout says nothing about how long
+    the command needs, and retries or backoff sleeps would inflate the estimate.
+    """
+    attempt_start = time.monotonic()
+    result = send_command(command, timeout_ms=timeout_ms)
+    timeout_resolver.record_execution_time(category, time.monotonic() - attempt_start)
+    return result
+
 class ExecutionStrategy(ABC):
     """Abstract base class for execution strategies."""
     
@@ -50,6 +69,7 @@ class DirectStrategy(ExecutionStrategy):
         """Execute command directly."""
         start_time = datetime.now()
         timeout_resolver = get_timeout_resolver()
+        timeout_ms, category = 0, None
         
         try:
             # Resolve timeout
@@ -58,10 +78,10 @@ class DirectStrategy(ExecutionStrategy):
                 category_override=context.timeout_category
             )
             
-            logger.debug(f"Direct execution: {context.command} (timeout: {timeout_ms}ms, category: {category})")
+            logger.debug("Direct execution: %s (timeout: %dms, category: %s)", context.command, timeout_ms, category)
             
             # Execute command
-            result = send_command(context.command, timeout_ms=timeout_ms)
+            result = _send_and_record(context.command, timeout_ms, category, timeout_resolver)
             
             execution_time = (datetime.now() - start_time).total_seconds()
             
@@ -84,8 +104,8 @@ class DirectStrategy(ExecutionStrategy):
                 error=str(e),
                 execution_mode=self.get_execution_mode(),
                 execution_time=execution_time,
-                timeout_category=category if 'category' in locals() else None,
-                timeout_ms=timeout_ms if 'timeout_ms' in locals() else 0,
+                timeout_category=category,
+                timeout_ms=timeout_ms,
                 timed_out=timed_out,
                 started_at=start_time
             )
@@ -111,14 +131,16 @@ class ResilientStrategy(ExecutionStrategy):
             category_override=context.timeout_category
         )
         
-        logger.debug(f"Resilient execution: {context.command} (timeout: {timeout_ms}ms, category: {category})")
+        logger.debug("Resilient execution: %s (timeout: %dms, category: %s)", context.command, timeout_ms, category)
         
         # Execute with retry logic
         try:
             result = execute_with_retry(
-                send_command,
+                _send_and_record,
                 context.command,
-                timeout_ms=timeout_ms,
+                timeout_ms,
+                category,
+                timeout_resolver,
                 max_attempts=context.max_retries,
                 delay_base_ms=context.retry_delay_base_ms,
                 exponential_backoff=context.exponential_backoff,
@@ -171,11 +193,30 @@ class OptimizedStrategy(ExecutionStrategy):
             category_override=context.timeout_category
         )
         
-        logger.debug(f"Optimized execution: {context.command} (timeout: {timeout_ms}ms, category: {category})")
+        logger.debug("Optimized execution: %s (timeout: %dms, category: %s)", context.command, timeout_ms, category)
+        
+        # Static read-only commands are served from cache until the target runs
+        cache_key = context.command.strip().lower()
+        cacheable = cache_key in CACHEABLE_COMMANDS
+        if cacheable:
+            cached_result = get_cached_command_result(cache_key)
+            if cached_result is not None:
+                return create_success_result(
+                    result=cached_result,
+                    execution_mode=self.get_execution_mode(),
+                    execution_time=(datetime.now() - start_time).total_seconds(),
+                    cached=True,
+                    timeout_category=category,
+                    timeout_ms=timeout_ms,
+                    optimization_level="cached",
+                    started_at=start_time
+                )
         
         try:
             # Use direct execution - optimization features now handled at higher level
-            result = send_command(context.command, timeout_ms=timeout_ms)
+            result = _send_and_record(context.command, timeout_ms, category, timeout_resolver)
+            if cacheable:
+                cache_command_result(cache_key, result)
             
             execution_time = (datetime.now() - start_time).total_seconds()
             
@@ -183,7 +224,7 @@ class OptimizedStrategy(ExecutionStrategy):
                 result=result,
                 execution_mode=self.get_execution_mode(),
                 execution_time=execution_time,
-                cached=False,  # Caching now handled by unified cache system
+                cached=False,
                 compressed=False,  # Compression handled at transport level
                 original_size=len(result.encode('utf-8')) if result else 0,
                 timeout_category=category,
@@ -226,12 +267,12 @@ class AsyncStrategy(ExecutionStrategy):
             category_override=context.timeout_category
         )
         
-        logger.debug(f"Async execution: {context.command} (timeout: {timeout_ms}ms, category: {category})")
+        logger.debug("Async execution: %s (timeout: %dms, category: %s)", context.command, timeout_ms, category)
         
         try:
             # For now, use direct execution but mark as async
             # In future, this could be enhanced with true async capabilities
-            result = send_command(context.command, timeout_ms=timeout_ms)
+            result = _send_and_record(context.command, timeout_ms, category, timeout_resolver)
             
             execution_time = (datetime.now() - start_time).total_seconds()
             
@@ -261,6 +302,11 @@ class AsyncStrategy(ExecutionStrategy):
         return ExecutionMode.ASYNC
 
 # Strategy factory
+def is_command_cached(command: str) -> bool:
+    """Check whether OptimizedStrategy would answer command from the cache."""
+    cache_key = command.strip().lower()
+    return cache_key in CACHEABLE_COMMANDS and has_cached_command_result(cache_key)
+
 def create_strategy(
     resilient: bool = True,
     optimize: bool = True, 
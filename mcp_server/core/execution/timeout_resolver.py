@@ -5,10 +5,15 @@ This module consolidates all timeout logic and eliminates duplication across
 the resilient, optimization, and streaming systems.
 """
 import logging
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Union
+from dataclasses import dataclass
 from enum import Enum
 
-from config import get_timeout_for_command, DebuggingMode
+from config import (
+    get_timeout_for_command, DebuggingMode, DEFAULT_TIMEOUTS,
+    ADAPTIVE_TIMEOUTS_ENABLED, ADAPTIVE_TIMEOUT_MIN_SAMPLES
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +38,27 @@ LEGACY_CATEGORY_MAP = {
     "very_slow": TimeoutCategory.LARGE_ANALYSIS
 }
 
+@dataclass(slots=True)
+class ExecutionTimeEstimate:
+    """Smoothed execution time and mean deviation for a timeout category (ms)."""
+    srtt_ms: float = 0.0
+    rttvar_ms: float = 0.0
+    samples: int = 0
+    
+    def update(self, sample_ms: float):
+        """Fold in a new observation (RFC 6298 style, alpha=1/8, beta=1/4)."""
+        if self.samples == 0:
+            self.srtt_ms = sample_ms
+            self.rttvar_ms = sample_ms / 2
+        else:
+            self.rttvar_ms = 0.75 * self.rttvar_ms + 0.25 * abs(self.srtt_ms - sample_ms)
+            self.srtt_ms = 0.875 * self.srtt_ms + 0.125 * sample_ms
+        self.samples += 1
+    
+    @property
+    def timeout_ms(self) -> float:
+        return self.srtt_ms + 4 * self.rttvar_ms
+
 class TimeoutResolver:
     """
     Centralized timeout resolution system.
@@ -41,9 +67,16 @@ class TimeoutResolver:
     get_timeout_for_command, and hardcoded streaming timeouts.
     """
     
-    def __init__(self, default_mode: DebuggingMode = DebuggingMode.VM_NETWORK):
+    def __init__(
+        self,
+        default_mode: DebuggingMode = DebuggingMode.VM_NETWORK,
+        adaptive: bool = ADAPTIVE_TIMEOUTS_ENABLED
+    ):
         self.default_mode = default_mode
+        self.adaptive = adaptive
         self._category_cache: Dict[str, TimeoutCategory] = {}
+        self._estimates: Dict[TimeoutCategory, ExecutionTimeEstimate] = {}
+        self._estimates_lock = threading.Lock()
         
     def get_timeout(
         self, 
@@ -74,7 +107,54 @@ class TimeoutResolver:
                 return get_timeout_for_command(category_command, mode)
         
         # Use centralized config system
-        return get_timeout_for_command(command, mode)
+        static_timeout = get_timeout_for_command(command, mode)
+        
+        if self.adaptive:
+            # Estimates are pooled per category, so fast commands must never
+            # shorten the timeout of a slow command sharing that category
+            adaptive_timeout = self.get_adaptive_timeout(self.get_category(command))
+            if adaptive_timeout is not None:
+                return max(adaptive_timeout, static_timeout)
+        
+        return static_timeout
+    
+    def record_execution_time(
+        self,
+        category: Union[TimeoutCategory, str],
+        execution_time: float
+    ):
+        """
+        Record an observed execution time for adaptive timeouts.
+        
+        Args:
+            category: Timeout category (enum or name) the command ran under
+            execution_time: Duration of one successful attempt in seconds
+        """
+        if isinstance(category, str):
+            category = self._normalize_category(category)
+            if category is None:
+                return
+        
+        with self._estimates_lock:
+            estimate = self._estimates.get(category)
+            if estimate is None:
+                estimate = self._estimates[category] = ExecutionTimeEstimate()
+            estimate.update(execution_time * 1000)
+    
+    def get_adaptive_timeout(self, category: TimeoutCategory) -> Optional[int]:
+        """
+        Get the adaptive timeout for a category, or None until enough samples exist.
+        
+        The estimate (smoothed time + 4x deviation) is clamped to the quick and
+        extended timeouts. It is not scaled by the debugging mode multiplier:
+        the observed times already reflect how slow the mode is. get_timeout
+        only uses it to extend the static per-command timeout, never to shorten it.
+        """
+        estimate = self._estimates.get(category)
+        if estimate is None or estimate.samples < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return None
+        
+        return int(min(max(estimate.timeout_ms, DEFAULT_TIMEOUTS.quick), DEFAULT_TIMEOUTS.extended))
     
     def get_category(self, command: str) -> TimeoutCategory:
         """
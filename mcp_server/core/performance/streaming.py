@@ -12,6 +12,20 @@ from core.communication import send_command
 
 logger = logging.getLogger(__name__)
 
+def _iter_line_chunks(text: str, chunk_lines: int) -> Generator[str, None, None]:
+    """Yield successive slices of ``chunk_lines`` lines without splitting the whole text."""
+    start = 0
+    length = len(text)
+    while start <= length:
+        end = start
+        for _ in range(chunk_lines):
+            end = text.find('\n', end) + 1
+            if end == 0:
+                end = length + 1
+                break
+        yield text[start:end - 1]
+        start = end
+
 class StreamingHandler:
     """Handles streaming of large command outputs."""
     
@@ -67,18 +81,17 @@ class StreamingHandler:
                 }
             else:
                 # Stream in chunks
-                lines = result.split('\n')
-                total_lines = len(lines)
+                total_lines = result.count('\n') + 1
                 chunk_lines = max(10, total_lines // 20)  # ~20 chunks
                 
-                for i in range(0, total_lines, chunk_lines):
-                    chunk = '\n'.join(lines[i:i + chunk_lines])
+                for chunk_index, chunk in enumerate(_iter_line_chunks(result, chunk_lines)):
+                    i = chunk_index * chunk_lines
                     progress = min(1.0, (i + chunk_lines) / total_lines)
                     
                     yield {
                         "type": "chunk",
                         "data": chunk,
-                        "chunk_index": i // chunk_lines,
+                        "chunk_index": chunk_index,
                         "progress": progress,
                         "is_final": (i + chunk_lines) >= total_lines
                     }
@@ -6,12 +6,14 @@ session interruptions, and context preservation for kernel debugging scenarios.
 """
 import logging
 import json
+import re
 import time
 import os
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
+from itertools import islice
 from pathlib import Path
 
 from .communication import send_command, test_connection, CommunicationError, TimeoutError, ConnectionError
@@ -22,6 +24,11 @@ from config import get_timeout_for_command, DebuggingMode
 
 logger = logging.getLogger(__name__)
 
+_PROCESS_ADDRESS_RE = re.compile(r'PROCESS\s+([a-fA-F0-9`]+)')
+_THREAD_ADDRESS_RE = re.compile(r'THREAD\s+([0-9a-f]+)')
+# 'lm' module rows start with the start and end addresses of the image
+_LM_MODULE_LINE_RE = re.compile(r'^[0-9a-f`]{8,}\s+[0-9a-f`]{8,}\s.*$', re.M | re.I)
+
 # Remove old session cache implementation - now using unified cache
 
 class SessionState(Enum):
@@ -154,8 +161,7 @@ class SessionRecovery:
                     proc_info = send_command("!process -1 0", timeout_ms=get_timeout_for_command("!process -1 0"))
                     if "PROCESS" in proc_info:
                         # Extract current process address
-                        import re
-                        match = re.search(r'PROCESS\s+([a-fA-F0-9`]+)', proc_info)
+                        match = _PROCESS_ADDRESS_RE.search(proc_info)
                         if match:
                             snapshot.current_process = match.group(1)
                 except (CommunicationError, TimeoutError, ConnectionError) as e:
@@ -169,9 +175,8 @@ class SessionRecovery:
             try:
                 # In kernel mode, use !thread to get current thread info instead of ~.
                 thread_info = send_command("!thread", timeout_ms=get_timeout_for_command("!thread"))
-                import re
                 # Look for THREAD pattern in kernel mode output
-                match = re.search(r'THREAD\s+([0-9a-f]+)', thread_info)
+                match = _THREAD_ADDRESS_RE.search(thread_info)
                 if match:
                     snapshot.current_thread = match.group(1)
                 else:
@@ -210,9 +215,9 @@ class SessionRecovery:
             # Get loaded modules (limited)
             try:
                 modules_info = send_command("lm", timeout_ms=get_timeout_for_command("lm"))
-                # Parse module information (simplified)
-                module_lines = modules_info.split('\n')[:10]  # Limit to first 10 modules
-                snapshot.modules = [{"info": line.strip()} for line in module_lines if line.strip()]
+                # Parse module information (simplified), scanning only as far as needed
+                module_lines = islice(_LM_MODULE_LINE_RE.finditer(modules_info), 10)  # Limit to first 10 modules
+                snapshot.modules = [{"info": match.group(0).strip()} for match in module_lines]
             except (CommunicationError, TimeoutError, ConnectionError) as e:
                 logger.warning(f"Failed to get loaded modules: {e}")
                 pass
@@ -17,7 +17,7 @@ import gzip
 from typing import Dict, Any, Optional, List, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from collections import OrderedDict
+from collections import OrderedDict, Counter
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -79,6 +79,9 @@ class UnifiedCache:
         self._cache: OrderedDict[str, UnifiedCacheEntry] = OrderedDict()
         self._lock = threading.Lock()
         self._startup_active = False
+        # Lookup outcomes per context, for profiling cache effectiveness
+        self._hits = Counter()
+        self._misses = Counter()
         
         # Context-specific TTL defaults (in seconds)
         self._default_ttls = {
@@ -189,24 +192,34 @@ class UnifiedCache:
             
             if oldest_key:
                 del self._cache[oldest_key]
-                logger.debug(f"Evicted cache entry: {oldest_key}")
+                logger.debug("Evicted cache entry: %s", oldest_key)
     
-    def get(self, command_or_id: str, context: CacheContext, extra_context: Dict[str, Any] = None) -> Optional[Any]:
-        """Get cached data."""
+    def get(self, command_or_id: str, context: CacheContext, extra_context: Dict[str, Any] = None,
+            max_age_s: Optional[float] = None) -> Optional[Any]:
+        """Get cached data; entries older than max_age_s are treated as absent."""
         key = self._generate_key(command_or_id, context, extra_context)
         
         with self._lock:
-            if key not in self._cache:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses[context.value] += 1
                 return None
             
-            entry = self._cache[key]
-            
             # Check if entry is expired (except for startup context)
             if context != CacheContext.STARTUP and entry.is_expired():
                 del self._cache[key]
-                logger.debug(f"Cache entry expired: {command_or_id}")
+                self._misses[context.value] += 1
+                logger.debug("Cache entry expired: %s", command_or_id)
+                return None
+            
+            # Too old for this caller, but still valid for others
+            age = (datetime.now() - entry.timestamp).total_seconds()
+            if max_age_s is not None and age > max_age_s:
+                self._misses[context.value] += 1
                 return None
             
+            self._hits[context.value] += 1
+            
             # Update access info and move to end (most recent)
             entry.touch()
             self._cache.move_to_end(key)
@@ -214,9 +227,19 @@ class UnifiedCache:
             # Decompress if needed
             data = self._decompress_data(entry.data, entry.compressed)
             
-            logger.debug(f"Cache hit: {command_or_id} (context: {context.value}, age: {(datetime.now() - entry.timestamp).total_seconds():.1f}s)")
+            logger.debug("Cache hit: %s (context: %s, age: %.1fs)", command_or_id, context.value, age)
             return data
     
+    def contains(self, command_or_id: str, context: CacheContext, extra_context: Dict[str, Any] = None) -> bool:
+        """Check for a live entry without touching or decompressing it."""
+        key = self._generate_key(command_or_id, context, extra_context)
+        
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False
+            return context == CacheContext.STARTUP or not entry.is_expired()
+    
     def put(self, command_or_id: str, data: Any, context: CacheContext, 
             extra_context: Dict[str, Any] = None, ttl: int = None, 
             priority: CachePriority = CachePriority.NORMAL) -> bool:
@@ -257,7 +280,8 @@ class UnifiedCache:
             )
             
             self._cache[key] = entry
-            logger.debug(f"Cached: {command_or_id} (context: {context.value}, TTL: {ttl}s, compressed: {was_compressed})")
+            logger.debug("Cached: %s (context: %s, TTL: %ss, compressed: %s)",
+                         command_or_id, context.value, ttl, was_compressed)
             return True
     
     def invalidate(self, command_or_id: str = None, context: CacheContext = None, pattern: str = None) -> int:
@@ -285,7 +309,7 @@ class UnifiedCache:
                 removed_count += 1
         
         if removed_count > 0:
-            logger.debug(f"Invalidated {removed_count} cache entries")
+            logger.debug("Invalidated %d cache entries", removed_count)
         
         return removed_count
     
@@ -298,7 +322,7 @@ class UnifiedCache:
         with self._lock:
             count = len(self._cache)
             self._cache.clear()
-            logger.debug(f"Cleared all cache entries ({count} total)")
+            logger.debug("Cleared all cache entries (%d total)", count)
     
     def start_startup_caching(self):
         """Enable startup caching context."""
@@ -342,6 +366,8 @@ class UnifiedCache:
                 "total_data_size": total_size,
                 "total_compressed": compressed_count,
                 "contexts": stats_by_context,
+                "hits": dict(self._hits),
+                "misses": dict(self._misses),
                 "startup_active": self._startup_active
             }
 
@@ -357,6 +383,10 @@ def get_cached_command_result(command: str) -> Optional[str]:
     """Get cached command result."""
     return unified_cache.get(command, CacheContext.COMMAND)
 
+def has_cached_command_result(command: str) -> bool:
+    """Check whether a command result is cached."""
+    return unified_cache.contains(command, CacheContext.COMMAND)
+
 def cache_session_snapshot(session_id: str, snapshot: Any) -> bool:
     """Cache a session snapshot."""
     return unified_cache.put(session_id, snapshot, CacheContext.SESSION, priority=CachePriority.HIGH)
@@ -381,9 +411,9 @@ def cache_startup_command(command: str, result: str) -> bool:
     """Cache a startup command result."""
     return unified_cache.put(command, result, CacheContext.STARTUP, priority=CachePriority.CRITICAL)
 
-def get_startup_cached_result(command: str) -> Optional[str]:
-    """Get startup cached command result."""
-    return unified_cache.get(command, CacheContext.STARTUP)
+def get_startup_cached_result(command: str, max_age_s: Optional[float] = None) -> Optional[str]:
+    """Get startup cached command result, optionally no older than max_age_s."""
+    return unified_cache.get(command, CacheContext.STARTUP, max_age_s=max_age_s)
 
 def invalidate_command_cache(command: str = None, pattern: str = None) -> int:
     """Invalidate command cache entries."""
@@ -60,6 +60,14 @@ ALWAYS_SAFE_PREFIXES = {
     "!vprot", "!pte"
 }
 
+# Lowercased once so the prefix check is a single C-level startswith call
+_SAFE_PREFIXES = tuple(prefix.lower() for prefix in ALWAYS_SAFE_PREFIXES)
+
+# Command families allowed by name, shared by validation and automation checks
+BREAKPOINT_COMMANDS = frozenset({"bp", "ba", "bu", "bm", "bc", "bd", "be"})
+EXECUTION_COMMANDS = frozenset({"g", "p", "t", "gu", "wt"})
+CONTEXT_COMMANDS = frozenset({".thread", ".process"})
+
 def validate_command(command: str) -> Tuple[bool, Optional[str]]:
     """
     Validate a WinDbg command for basic safety.
@@ -82,33 +90,29 @@ def validate_command(command: str) -> Tuple[bool, Optional[str]]:
         return False, f"Command too long ({len(command)} chars, max {MAX_COMMAND_LENGTH})"
     
     # Extract the base command (first word)
-    command_parts = command.split()
-    if not command_parts:
-        return False, "Invalid command format"
-    
-    base_command = command_parts[0].lower()
+    command_lower = command.lower()
+    base_command = command_lower.split(None, 1)[0]
     
     # Check if it's a dangerous command
     if base_command in DANGEROUS_COMMANDS:
         return False, f"Command '{base_command}' is restricted for safety. It could terminate the debugging session or cause system damage."
     
     # Check if it starts with a safe prefix
-    for safe_prefix in ALWAYS_SAFE_PREFIXES:
-        if command.lower().startswith(safe_prefix.lower()):
-            return True, None
+    if command_lower.startswith(_SAFE_PREFIXES):
+        return True, None
     
     # Special validation for specific command types
     
     # Allow breakpoint setting/clearing (but not dangerous operations)
-    if base_command in ["bp", "ba", "bu", "bm", "bc", "bd", "be"]:
+    if base_command in BREAKPOINT_COMMANDS:
         return True, None
     
     # Allow execution control commands (these are needed for debugging)
-    if base_command in ["g", "p", "t", "gu", "wt"]:
+    if base_command in EXECUTION_COMMANDS:
         return True, None
     
     # Allow thread/process context switching
-    if base_command in [".thread", ".process"]:
+    if base_command in CONTEXT_COMMANDS:
         return True, None
     
     # Allow meta commands that are generally safe
@@ -145,28 +149,25 @@ def is_safe_for_automation(command: str) -> bool:
     command = command.strip().lower()
     
     # Never allow dangerous commands that could terminate sessions or cause damage
-    base_command = command.split()[0] if command.split() else ""
+    base_command = command.split(None, 1)[0]
     if base_command in DANGEROUS_COMMANDS:
         return False
     
     # CHANGED: Now allow execution control commands for LLM automation
     # These are essential for interactive debugging workflows
-    execution_commands = {"g", "p", "t", "gu", "wt"}
-    if base_command in execution_commands:
+    if base_command in EXECUTION_COMMANDS:
         logger.info(f"Allowing execution control command for automation: {base_command}")
         return True
     
     # CHANGED: Now allow breakpoint commands for LLM automation  
     # These are needed for setting up debugging scenarios
-    breakpoint_commands = {"bp", "ba", "bu", "bm", "bc", "bd", "be"}
-    if base_command in breakpoint_commands:
+    if base_command in BREAKPOINT_COMMANDS:
         logger.info(f"Allowing breakpoint command for automation: {base_command}")
         return True
     
     # CHANGED: Now allow context switches for LLM automation
     # These are often needed for comprehensive debugging
-    context_commands = {".thread", ".process"}
-    if base_command in context_commands:
+    if base_command in CONTEXT_COMMANDS:
         logger.info(f"Allowing context switch command for automation: {base_command}")
         return True
     
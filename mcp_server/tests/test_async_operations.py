@@ -0,0 +1,71 @@
+"""
+Tests for the asynchronous task manager.
+"""
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add parent directory to the path to import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.async_ops.task_manager import AsyncOperationManager, TaskStatus
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestIterParallelCommands:
+    """Test streaming parallel execution."""
+
+    def test_early_close_cancels_queued_future_without_deadlock(self):
+        """Closing the generator while tasks run must not wedge the manager."""
+        release_slow = threading.Event()
+
+        def fake_execute(command, **kwargs):
+            if command == "slow":
+                release_slow.wait(10)
+            return Mock(
+                success=True, result=f"{command} output", cached=False,
+                execution_time=0.0, retries_attempted=0, timeout_ms=1000,
+                execution_mode=Mock(value="direct")
+            )
+
+        # One worker: "slow" occupies it, so "queued" sits in the executor
+        # with a cancellable future; "fast" is served inline as a cache hit
+        manager = AsyncOperationManager(max_workers=1, max_concurrent=3)
+        with patch('core.async_ops.task_manager.execute_command', side_effect=fake_execute), \
+             patch('core.async_ops.task_manager.is_command_cached',
+                   side_effect=lambda command: command == "fast"):
+            try:
+                results = manager.iter_parallel_commands(["slow", "fast", "queued"])
+                command, task = next(results)
+                assert command == "fast"
+
+                queued = next(t for t in manager.tasks.values() if t.command == "queued")
+                assert _wait_until(lambda: queued.task_id in manager.running_tasks)
+
+                closer = threading.Thread(target=results.close, daemon=True)
+                closer.start()
+                closer.join(5)
+                assert not closer.is_alive(), "closing the generator deadlocked"
+                assert queued.status is TaskStatus.CANCELLED
+            finally:
+                release_slow.set()
+
+            task_id = manager.submit_command("later")
+            assert manager.get_task_result(task_id, timeout=5) == "later output"
+
+        manager.executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,103 @@
+"""
+Tests for request coalescing in the communication manager.
+"""
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to the path to import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.communication import CommunicationManager, CommunicationError, TimeoutError
+
+
+class _BlockingSend:
+    """Stand-in for _send_command that blocks until released."""
+
+    def __init__(self, result="Windows 10 Kernel Version 19041", error=None):
+        self.result = result
+        self.error = error
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, command, timeout_ms):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def _start_leader(manager, outcome):
+    def run():
+        try:
+            outcome["result"] = manager.send_command("version")
+        except Exception as e:
+            outcome["error"] = e
+
+    leader = threading.Thread(target=run, daemon=True)
+    leader.start()
+    return leader
+
+
+class TestRequestCoalescing:
+    """Test that concurrent identical read-only commands share one request."""
+
+    def test_follower_gets_leader_result(self):
+        manager = CommunicationManager()
+        send = _BlockingSend()
+        with patch.object(manager, "_send_command", side_effect=send):
+            leader_outcome = {}
+            leader = _start_leader(manager, leader_outcome)
+            assert send.entered.wait(5)
+
+            # The follower joins while the leader's request is still in flight
+            threading.Timer(0.2, send.release.set).start()
+            assert manager.send_command(" VERSION ") == send.result
+
+            leader.join(5)
+            assert leader_outcome["result"] == send.result
+            assert send.calls == 1
+            assert not manager._inflight
+
+    def test_leader_exception_reaches_follower(self):
+        manager = CommunicationManager()
+        send = _BlockingSend(error=CommunicationError("pipe broken"))
+        with patch.object(manager, "_send_command", side_effect=send):
+            leader_outcome = {}
+            leader = _start_leader(manager, leader_outcome)
+            assert send.entered.wait(5)
+
+            threading.Timer(0.2, send.release.set).start()
+            with pytest.raises(CommunicationError, match="pipe broken"):
+                manager.send_command("version")
+
+            leader.join(5)
+            assert isinstance(leader_outcome["error"], CommunicationError)
+            assert send.calls == 1
+
+    def test_follower_times_out_waiting_for_leader(self):
+        manager = CommunicationManager()
+        send = _BlockingSend()
+        with patch.object(manager, "_send_command", side_effect=send):
+            leader_outcome = {}
+            leader = _start_leader(manager, leader_outcome)
+            assert send.entered.wait(5)
+
+            try:
+                with pytest.raises(TimeoutError, match="in-flight"):
+                    manager.send_command("version", timeout_ms=50)
+            finally:
+                send.release.set()
+
+            leader.join(5)
+            assert leader_outcome["result"] == send.result
+            assert send.calls == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,96 @@
+"""
+Tests for the debugging context manager.
+"""
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add parent directory to the path to import the modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.context import ContextManager, DebugContext
+
+PROBE_OUTPUT = (
+    "Implicit process is now ffffa00011112222\n"
+    "Implicit process is ffffa00011112222\n"
+    "Current thread is ffffa00033334444\n"
+)
+
+
+def _debugger(restore_output="Implicit process is now ffffa00055556666"):
+    """Fake send_command answering the context probe and restore commands."""
+    def send(command):
+        if command == ".process; .thread":
+            return PROBE_OUTPUT
+        return restore_output
+    return Mock(side_effect=send)
+
+
+class TestSavedContextCache:
+    """Test the TTL cache in front of the .process/.thread probe."""
+
+    def test_reuses_context_within_ttl(self):
+        manager = ContextManager(cache_ttl=60.0)
+        send = _debugger()
+
+        first = manager.save_current_context(send)
+        second = manager.save_current_context(send)
+
+        assert first.process_address == "ffffa00011112222"
+        assert first.thread_address == "ffffa00033334444"
+        assert second == first
+        assert send.call_count == 1
+
+    def test_requeries_after_ttl_expires(self):
+        manager = ContextManager(cache_ttl=2.0)
+        send = _debugger()
+
+        with patch('core.context.time.monotonic', side_effect=[100.0, 101.0, 103.0, 103.0]):
+            manager.save_current_context(send)
+            manager.save_current_context(send)
+            assert send.call_count == 1
+            manager.save_current_context(send)
+            assert send.call_count == 2
+
+    def test_switch_invalidates_cache(self):
+        manager = ContextManager(cache_ttl=60.0)
+        send = _debugger()
+
+        manager.save_current_context(send)
+        assert manager.switch_to_process("ffffa00055556666", send)
+        manager.save_current_context(send)
+
+        probes = [c for c in send.call_args_list if c.args[0] == ".process; .thread"]
+        assert len(probes) == 2
+
+    def test_failed_restore_invalidates_cache(self):
+        manager = ContextManager(cache_ttl=60.0)
+        send = _debugger(restore_output="Failed to set implicit process")
+
+        manager.save_current_context(send)
+        target = DebugContext(process_address="ffffa00055556666", thread_address="ffffa00077778888")
+        assert not manager.restore_context(target, send)
+        manager.save_current_context(send)
+
+        probes = [c for c in send.call_args_list if c.args[0] == ".process; .thread"]
+        assert len(probes) == 2
+
+    def test_returns_copies_of_cached_context(self):
+        manager = ContextManager(cache_ttl=60.0)
+        send = _debugger()
+
+        first = manager.save_current_context(send)
+        first.process_address = "0"
+        second = manager.save_current_context(send)
+        second.thread_address = "0"
+        third = manager.save_current_context(send)
+
+        assert send.call_count == 1
+        assert third.process_address == "ffffa00011112222"
+        assert third.thread_address == "ffffa00033334444"
+        assert third is not second
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+MCP_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Add parent directory to the path to import the modules
+sys.path.append(MCP_SERVER_DIR)
+
+
+def _run_in_fresh_interpreter(code, cwd):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [MCP_SERVER_DIR, env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def test_session_recovery_export_is_instance_after_submodule_import(tmp_path):
+    code = (
+        "import core.session_recovery\n"
+        "import core\n"
+        "from core import session_recovery\n"
+        "from core.session_recovery import SessionRecovery\n"
+        "assert isinstance(core.session_recovery, SessionRecovery), type(core.session_recovery)\n"
+        "assert isinstance(session_recovery, SessionRecovery), type(session_recovery)\n"
+    )
+    result = _run_in_fresh_interpreter(code, tmp_path)
+    assert result.returncode == 0, result.stderr
+
+
+def test_lazy_exports_resolve():
+    import core
+    from core.async_ops import AsyncOperationManager
+    assert isinstance(core.async_manager, AsyncOperationManager)
+    assert "performance_optimizer" in core.__all__
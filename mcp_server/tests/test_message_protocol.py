@@ -14,3 +14,8 @@ def test_parse_response_success():
     assert parsed["status"] == "success"
     assert parsed["output"] == "ok"
 
+
+def test_detect_network_debugging_error_ignores_case():
+    assert MessageProtocol.detect_network_debugging_error("Target Windows seems LOST")
+    assert MessageProtocol.detect_network_debugging_error("Resync with target")
+    assert not MessageProtocol.detect_network_debugging_error("Command completed")
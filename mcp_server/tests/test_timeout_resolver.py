@@ -1,6 +1,8 @@
 import pytest
 
-from mcp_server.core.execution.timeout_resolver import TimeoutResolver, TimeoutCategory
+from mcp_server.core.execution.timeout_resolver import (
+    TimeoutResolver, TimeoutCategory, DebuggingMode, DEFAULT_TIMEOUTS
+)
 
 
 def test_quick_commands():
@@ -29,3 +31,54 @@ def test_execution_and_memory():
     assert r.get_category("bp nt!NtCreateFile") == TimeoutCategory.EXECUTION
     assert r.get_category("dd 0x1000") == TimeoutCategory.MEMORY
 
+
+def test_adaptive_timeout_needs_min_samples():
+    r = TimeoutResolver(adaptive=True)
+    static_timeout = r.get_timeout("!analyze -v")
+    for _ in range(7):
+        r.record_execution_time(TimeoutCategory.LARGE_ANALYSIS, 30.0)
+    assert r.get_timeout("!analyze -v") == static_timeout
+
+    r.record_execution_time("large_analysis", 30.0)
+    assert r.get_adaptive_timeout(TimeoutCategory.LARGE_ANALYSIS) is not None
+    # Fast samples never shorten the static timeout
+    assert r.get_timeout("!analyze -v") == static_timeout
+
+
+def test_adaptive_timeout_only_extends_static_timeout():
+    r = TimeoutResolver(adaptive=True)
+    reload_timeout = r.get_timeout(".reload")
+    for _ in range(8):
+        r.record_execution_time(TimeoutCategory.SYMBOLS, 0.05)
+    assert r.get_timeout(".reload") == reload_timeout
+
+    analyze_timeout = r.get_timeout("!analyze -v")
+    for _ in range(8):
+        r.record_execution_time(TimeoutCategory.LARGE_ANALYSIS, 700.0)
+    assert r.get_timeout("!analyze -v") > analyze_timeout
+
+
+def test_adaptive_timeout_is_not_scaled_by_mode():
+    r = TimeoutResolver(adaptive=True)
+    for _ in range(8):
+        r.record_execution_time(TimeoutCategory.BULK, 300.0)
+    # Observed times already include the mode's slowness, so no 2x on top
+    adaptive_timeout = r.get_adaptive_timeout(TimeoutCategory.BULK)
+    assert 300000 < adaptive_timeout < 2 * 300000
+    assert r.get_timeout("!vm", DebuggingMode.VM_NETWORK) == adaptive_timeout
+    assert r.get_timeout("!vm", DebuggingMode.LOCAL) == adaptive_timeout
+
+
+def test_adaptive_timeout_is_clamped_to_quick():
+    r = TimeoutResolver(adaptive=True)
+    for _ in range(10):
+        r.record_execution_time(TimeoutCategory.QUICK, 0.01)
+    assert r.get_timeout("version", DebuggingMode.LOCAL) == DEFAULT_TIMEOUTS.quick
+
+
+def test_command_category_map_matches_scan():
+    from mcp_server.config import COMMAND_CATEGORY_MAP, _scan_timeout_category
+    for command, category in COMMAND_CATEGORY_MAP.items():
+        assert category == _scan_timeout_category(command)
+    assert COMMAND_CATEGORY_MAP["lm"] == "bulk"
+    assert COMMAND_CATEGORY_MAP["!process 0 0"] == "process_list"
@@ -10,13 +10,22 @@ from datetime import datetime
 
 from core.execution import (
     UnifiedCommandExecutor, ExecutionContext, ExecutionResult, ExecutionMode,
-    TimeoutResolver, get_executor, execute_command
+    TimeoutResolver, get_executor, execute_command, is_command_cached
 )
 from core.execution.strategies import (
     DirectStrategy, ResilientStrategy, OptimizedStrategy, AsyncStrategy
 )
 from core.execution.timeout_resolver import TimeoutCategory
-from config import DebuggingMode
+from core.unified_cache import invalidate_command_cache
+from core.communication import send_command, TimeoutError
+from config import DebuggingMode, invalidates_command_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_command_cache():
+    """Keep cached command output from leaking between tests."""
+    invalidate_command_cache()
+    yield
 
 
 class TestTimeoutResolver:
@@ -131,6 +140,25 @@ class TestExecutionStrategies:
         assert result.execution_mode == ExecutionMode.RESILIENT
         mock_retry.assert_called_once()
     
+    @patch('core.execution.strategies.send_command')
+    def test_timeouts_do_not_raise_adaptive_timeout(self, mock_send):
+        """Test timed-out runs and retries are not fed to adaptive timeouts."""
+        mock_send.side_effect = TimeoutError("Command timed out")
+        resolver = TimeoutResolver(adaptive=True)
+        static_timeout = resolver.get_timeout("!vm")
+        
+        with patch('core.execution.strategies.get_timeout_resolver', return_value=resolver):
+            for _ in range(12):
+                assert DirectStrategy().execute(ExecutionContext(command="!vm")).timed_out
+            
+            # Only the successful attempt is sampled, not the retry or its backoff
+            mock_send.side_effect = [TimeoutError("Command timed out"), "ok"]
+            context = ExecutionContext(command="!vm", max_retries=2, retry_delay_base_ms=1)
+            assert ResilientStrategy().execute(context).success
+        
+        assert resolver._estimates[TimeoutCategory.BULK].samples == 1
+        assert resolver.get_timeout("!vm") == static_timeout
+    
     @patch('core.execution.strategies.send_command')
     def test_optimized_strategy_success(self, mock_send):
         """Test optimized strategy with direct execution."""
@@ -249,6 +277,60 @@ class TestUnifiedCommandExecutor:
         assert len(result["results"]) == 2  # Should stop after second command
         assert result["summary"]["execution_stopped"]
     
+    @patch('core.communication.CommunicationManager._send_command')
+    def test_static_commands_cached_until_target_runs(self, mock_send):
+        """Test read-only commands are cached and invalidated by execution control."""
+        mock_send.return_value = "Windows 10 Kernel Version 19041"
+        executor = UnifiedCommandExecutor()
+        assert not is_command_cached("version")
+        
+        first = executor.execute("version", resilient=False, optimize=True)
+        assert is_command_cached(" Version ")
+        second = executor.execute("version", resilient=False, optimize=True)
+        assert not first.cached
+        assert second.cached
+        assert second.result == first.result
+        assert mock_send.call_count == 1
+        
+        executor.execute("g", resilient=False, optimize=True)
+        assert not is_command_cached("version")
+        third = executor.execute("version", resilient=False, optimize=True)
+        assert not third.cached
+        assert mock_send.call_count == 3
+        
+        # Chained commands invalidate too, even when sent outside the executor
+        send_command("bp nt!NtCreateFile; g")
+        assert not is_command_cached("version")
+    
+    def test_cache_invalidating_commands(self):
+        """Test execution-control variants and chained commands are recognized."""
+        for command in ["g", "gh", "gn", "gc", "pa 0x1000", "pc", "pt", "ph", "ta 0x1000",
+                        "tc", "tt", "th", "~*g", "~3g", "bp nt!NtCreateFile; g", "bc *",
+                        ".reload /f", "k; gu"]:
+            assert invalidates_command_cache(command), command
+        for command in ["version", "lm", "k", "dt nt!_EPROCESS", "~3s", "bl"]:
+            assert not invalidates_command_cache(command), command
+    
+    def test_context_switches_invalidate_cache(self):
+        """Test process, thread, machine and register-context switches invalidate."""
+        for command in [".effmach x86", ".process /r /p ffffa00012345678", ".process /i ffffa00012345678",
+                        ".thread /p /r ffffa00012345678", "|1s", "| 2 s", ".cxr 0x1000", ".cxr", ".ecxr"]:
+            assert invalidates_command_cache(command), command
+        # Bare forms only display the current context
+        for command in [".effmach", ".process", ".thread", ".process; .thread", "|"]:
+            assert not invalidates_command_cache(command), command
+    
+    @patch('core.communication.CommunicationManager._send_command')
+    def test_process_switch_drops_cached_module_list(self, mock_send):
+        """Test a cached lm is not served after switching process."""
+        mock_send.return_value = "start end module name"
+        executor = UnifiedCommandExecutor()
+        executor.execute("lm", resilient=False, optimize=True)
+        assert is_command_cached("lm")
+        
+        send_command(".process /r /p ffffa00012345678")
+        assert not is_command_cached("lm")
+    
     def test_strategy_caching(self):
         """Test that strategies are cached properly."""
         executor = UnifiedCommandExecutor()
@@ -110,6 +110,7 @@ def register_analysis_tools(mcp: FastMCP):
                     # Switch to the specified process
                     switch_cmd = f".process /i {address}"
                     result = send_command(switch_cmd, timeout_ms=_get_timeout(switch_cmd))
+                    context_mgr.invalidate_cache()
                     
                     return {
                         "success": True,
@@ -156,6 +157,7 @@ def register_analysis_tools(mcp: FastMCP):
                         # Switch to process first, then get PEB
                         switch_cmd = f".process /i {address}"
                         send_command(switch_cmd, timeout_ms=_get_timeout(switch_cmd))
+                        context_mgr.invalidate_cache()
                         
                     peb_result = send_command("!peb", timeout_ms=_get_timeout("!peb"))
                     return {"output": peb_result, "context": "Process Environment Block"}
@@ -233,6 +235,7 @@ def register_analysis_tools(mcp: FastMCP):
                 try:
                     switch_cmd = f"~{address}s"
                     result = send_command(switch_cmd, timeout_ms=_get_timeout(switch_cmd))
+                    context_mgr.invalidate_cache()
                     return {"output": result, "switched_to": address}
                 except Exception as e:
                     enhanced_error = enhance_error("execution", command=switch_cmd, original_error=str(e))
@@ -256,6 +259,7 @@ def register_analysis_tools(mcp: FastMCP):
                         # Switch to thread first, then get stack
                         switch_cmd = f"~{address}s"
                         send_command(switch_cmd, timeout_ms=_get_timeout(switch_cmd))
+                        context_mgr.invalidate_cache()
                     
                     stack_result = send_command(f"k {count}", timeout_ms=_get_timeout(f"k {count}"))
                     return {"output": stack_result, "stack_frames": count}
@@ -306,6 +310,7 @@ def register_analysis_tools(mcp: FastMCP):
                         # Switch to thread first
                         switch_cmd = f"~{address}s"
                         send_command(switch_cmd, timeout_ms=_get_timeout(switch_cmd))
+                        context_mgr.invalidate_cache()
                         
                     teb_result = send_command("!teb", timeout_ms=_get_timeout("!teb"))
                     return {"output": teb_result, "context": "Thread Environment Block"}
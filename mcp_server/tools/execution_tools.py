@@ -85,6 +85,8 @@ def register_execution_tools(mcp: FastMCP):
                 optimize=optimize,
                 async_mode=False  # Keep synchronous for tool compatibility
             )
+            # Arbitrary commands may switch process/thread context
+            get_context_manager().invalidate_cache()
             
             if execution_result.success:
                 # Convert to legacy format for backward compatibility
@@ -222,6 +224,7 @@ def register_execution_tools(mcp: FastMCP):
                         optimize=True,
                         async_mode=False
                     )
+                    context_manager.invalidate_cache()
                     
                     execution_time = execution_result.execution_time
                     total_execution_time += execution_time
@@ -436,6 +439,7 @@ def register_execution_tools(mcp: FastMCP):
                 logger.debug("Continuing execution")
                 try:
                     exec_result = execute_unified("g", resilient=True, optimize=True)
+                    context_manager.invalidate_cache()
                     execution_result = {
                         "step": "continue_execution",
                         "command": "g",
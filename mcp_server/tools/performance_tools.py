@@ -269,10 +269,10 @@ def register_performance_tools(mcp: FastMCP):
                 for command, task in results.items():
                     formatted_results[command] = {
                         "status": task.status.value,
-                        "success": task.status == TaskStatus.COMPLETED,
-                        "result": task.result if task.status == TaskStatus.COMPLETED else None,
+                        "success": task.status is TaskStatus.COMPLETED,
+                        "result": task.result if task.status is TaskStatus.COMPLETED else None,
                         "error": task.error,
-                        "execution_time": (task.completed_at - task.started_at).total_seconds() if task.started_at and task.completed_at else 0
+                        "execution_time": task.completed_ts - task.started_ts if task.started_ts is not None and task.completed_ts is not None else 0.0
                     }
                 
                 successful = sum(1 for r in formatted_results.values() if r["success"])